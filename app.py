@@ -1,17 +1,25 @@
-from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for
+from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, Response
 import os
 import json
 import threading
 import time
+import uuid
+import tempfile
 from datetime import datetime
 import logging
 
 
 # Import your existing SEO analysis modules
+from seo_pipeline import SEOPipeline
 from seo_crawler import SEOCrawler
-from seo_extractor import SEOExtractor
+from seo_extractor import ParallelExtractor
 from seo_recommendation import SEORecommendationGenerator
 from seo_report_generator import SEOReportGenerator
+from seo_events import EventBus
+from seo_jobs import JobQueue, QueueFull
+from seo_status_store import get_status_store, FINISHED_STATES
+from seo_frontier import normalize_url
+from seo_cache import ResultCache
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -20,78 +28,131 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'  # Change this in production
 
-# Global variable to store analysis status
-analysis_status = {}
+# Analysis statuses: in memory, or in a SQLite file shared by all server processes when
+# SEOLYZER_STATUS_DB is set. Entries expire SEOLYZER_STATUS_TTL seconds after their last update.
+analysis_status = get_status_store()
+status_lock = threading.RLock()
+
+# Per-analysis page results, recommendation tokens and status updates for /events
+events = EventBus()
+
+# Longest a /status?wait= long-poll or an idle /events stream blocks before answering
+MAX_STATUS_WAIT = 30
+
+# Status fields sent to /events subscribers (the rest are internal)
+EVENT_STATUS_FIELDS = ('status', 'progress', 'message', 'pages_analyzed', 'queue_position')
+
+# Analyses get generators derived from this one, so the OpenAI rate limits and the
+# LLM cache are shared instead of multiplied by the number of running jobs
+recommendation_generator = SEORecommendationGenerator()
+
+# Finished analyses are cached per start URL and pipeline settings in SEOLYZER_RESULT_CACHE_DIR,
+# for SEOLYZER_RESULT_CACHE_TTL seconds (default one hour; 0 turns the cache off)
+result_cache_ttl = int(os.getenv("SEOLYZER_RESULT_CACHE_TTL", "3600"))
+result_cache = ResultCache(
+    os.getenv("SEOLYZER_RESULT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "seolyzer")),
+    ttl=result_cache_ttl
+) if result_cache_ttl > 0 else None
+
+# Every analysis extracts pages in one long-lived process pool, started by the first
+# analysis; inline_pages=0 keeps even small crawls off the request threads
+extractor = ParallelExtractor(inline_pages=0)
+
+# Settings that determine an analysis' result, part of the result cache key
+result_config = SEOPipeline(crawler=SEOCrawler(), recommendation_generator=recommendation_generator).config()
+
+def set_status(analysis_id, status, replace=False):
+    """Update (or replace) an analysis' status and push it to /events subscribers"""
+    with status_lock:
+        if replace:
+            analysis_status.set(analysis_id, status)
+            current = status
+        else:
+            current = analysis_status.update(analysis_id, status)
+            if current is None:
+                return
+        events.publish(analysis_id, 'status', {key: current[key] for key in EVENT_STATUS_FIELDS if key in current})
 
 class SEOAnalysisRunner:
-    def __init__(self):
-        self.crawler = SEOCrawler()
-        self.extractor = SEOExtractor()
-        self.recommendation_generator = SEORecommendationGenerator()
+    def __init__(self, recommendation_generator=None):
+        # Crawl, extraction and recommendations run as one overlapped pipeline. Crawled
+        # pages are handed straight to the shared extractor (the crawler keeps only their
+        # URLs), whose worker processes parse them without competing with request
+        # threads for the GIL.
+        self.pipeline = SEOPipeline(extractor=extractor, recommendation_generator=recommendation_generator)
         self.report_generator = SEOReportGenerator()
         
+    def page_event(self, page_url, result):
+        """Summarize a finished page for /events: automated checks plus recommendations"""
+        seo_data = result['seo_data']
+        recommendations = result['recommendations']
+        page_score = self.report_generator.scorer.score_page(seo_data)
+        return {
+            'url': page_url,
+            'title': seo_data.get('meta_title'),
+            'score': page_score['score'],
+            'issues': page_score['issues'],
+            'recommendations': recommendations if isinstance(recommendations, dict) else None,
+            'error': None if isinstance(recommendations, dict) else recommendations
+        }
+        
+    def cache_result(self, url, report_path, results_with_recommendations):
+        """Keep a finished report so repeat submissions of the site are answered instantly"""
+        if not result_cache:
+            return
+        # A report with failed recommendations (no API key, outage, retries used up) would
+        # be served to every repeat submission until it expires
+        if not all(isinstance(result['recommendations'], dict) for result in results_with_recommendations.values()):
+            logger.info(f"Not caching the analysis of {url}: some recommendations failed")
+            return
+        try:
+            with open(report_path, encoding='utf-8') as f:
+                result_cache.save(url, self.pipeline.config(), f.read(), len(results_with_recommendations))
+        except Exception as e:
+            logger.warning(f"Could not cache the analysis of {url}: {str(e)}")
+        
     def run_analysis(self, url, analysis_id):
         """Run the complete SEO analysis"""
         try:
-            analysis_status[analysis_id] = {
+            set_status(analysis_id, {
                 'status': 'crawling',
                 'progress': 10,
                 'message': 'Starting website crawl...',
-                'start_time': datetime.now()
-            }
+                'start_time': datetime.now().isoformat()
+            }, replace=True)
             
-            # Step 1: Crawl the website
+            # Steps 1-3: Crawl, extract SEO data and generate recommendations
             logger.info(f"Starting crawl for {url}")
-            crawled_pages = self.crawler.crawl(url)
+            max_pages = self.pipeline.crawler.max_pages
             
-            if not crawled_pages:
-                analysis_status[analysis_id] = {
-                    'status': 'error',
-                    'message': 'Failed to crawl website. Please check the URL.',
-                    'progress': 0
-                }
-                return
+            def pipeline_progress(stage, page_url):
+                stats = self.pipeline.stats
+                done = stats['crawled'] + stats['extracted'] + stats['recommended']
+                set_status(analysis_id, {
+                    'status': 'analyzing' if stats['recommended'] else 'crawling',
+                    'progress': int(10 + (done / (3 * max_pages)) * 80),
+                    'message': (f"Crawled {stats['crawled']}, extracted {stats['extracted']}, "
+                                f"analyzed {stats['recommended']} pages...")
+                })
                 
-            analysis_status[analysis_id].update({
-                'status': 'extracting',
-                'progress': 30,
-                'message': f'Crawled {len(crawled_pages)} pages. Extracting SEO data...'
-            })
-            
-            # Step 2: Extract SEO data
-            seo_data = {}
-            for i, (page_url, html_content) in enumerate(crawled_pages.items()):
-                page_data = self.extractor.extract_seo_data(page_url, html_content)
-                seo_data[page_url] = page_data
+            def page_ready(page_url, result):
+                events.publish(analysis_id, 'page', self.page_event(page_url, result))
                 
-                progress = 30 + (i / len(crawled_pages)) * 30
-                analysis_status[analysis_id].update({
-                    'progress': int(progress),
-                    'message': f'Extracting data from page {i+1}/{len(crawled_pages)}'
-                })
+            def token(page_url, text):
+                events.publish(analysis_id, 'token', {'url': page_url, 'text': text})
                 
-            analysis_status[analysis_id].update({
-                'status': 'analyzing',
-                'progress': 60,
-                'message': 'Generating AI-powered recommendations...'
-            })
+            results_with_recommendations = self.pipeline.run(
+                url, on_result=page_ready, on_progress=pipeline_progress, on_token=token)
             
-            # Step 3: Generate recommendations
-            results_with_recommendations = {}
-            for i, (url_key, page_data) in enumerate(seo_data.items()):
-                recommendations = self.recommendation_generator.generate_recommendations(page_data)
-                results_with_recommendations[url_key] = {
-                    "seo_data": page_data,
-                    "recommendations": recommendations.get("recommendations", "Error generating recommendations")
-                }
-                
-                progress = 60 + (i / len(seo_data)) * 30
-                analysis_status[analysis_id].update({
-                    'progress': int(progress),
-                    'message': f'Analyzing page {i+1}/{len(seo_data)}'
-                })
+            if not results_with_recommendations:
+                set_status(analysis_id, {
+                    'status': 'error',
+                    'message': 'Failed to crawl website. Please check the URL.',
+                    'progress': 0
+                }, replace=True)
+                return
                 
-            analysis_status[analysis_id].update({
+            set_status(analysis_id, {
                 'status': 'generating_report',
                 'progress': 90,
                 'message': 'Generating beautiful report...'
@@ -105,28 +166,82 @@ class SEOAnalysisRunner:
             )
             
             if report_path:
-                analysis_status[analysis_id] = {
+                self.cache_result(url, report_path, results_with_recommendations)
+                set_status(analysis_id, {
                     'status': 'completed',
                     'progress': 100,
                     'message': 'Analysis complete!',
-                    'report_path': report_path,
-                    'end_time': datetime.now(),
-                    'pages_analyzed': len(seo_data)
-                }
+                    'report_path': os.path.abspath(report_path),
+                    'end_time': datetime.now().isoformat(),
+                    'pages_analyzed': len(results_with_recommendations)
+                }, replace=True)
             else:
-                analysis_status[analysis_id] = {
+                set_status(analysis_id, {
                     'status': 'error',
                     'message': 'Failed to generate report',
                     'progress': 90
-                }
+                }, replace=True)
                 
         except Exception as e:
             logger.error(f"Error in analysis: {str(e)}")
-            analysis_status[analysis_id] = {
+            set_status(analysis_id, {
                 'status': 'error',
                 'message': f'Analysis failed: {str(e)}',
                 'progress': 0
-            }
+            }, replace=True)
+        finally:
+            events.close(analysis_id)
+
+def queued_message(position):
+    """Status message for an analysis waiting in the job queue"""
+    if position > 1:
+        return f'Waiting for a free analysis slot ({position - 1} ahead of you)...'
+    return 'Next in line, starting soon...'
+
+def set_queue_position(analysis_id, position):
+    """Record a waiting analysis' queue position, unless a worker has already picked it up"""
+    with status_lock:
+        if (analysis_status.get(analysis_id) or {}).get('status') == 'queued':
+            set_status(analysis_id, {
+                'queue_position': position,
+                'message': queued_message(position)
+            })
+
+def run_job(analysis_id, url):
+    """Job queue handler: run one analysis on a worker thread"""
+    # Everyone still waiting moved up one place
+    for queued_id, position in jobs.positions().items():
+        set_queue_position(queued_id, position)
+    SEOAnalysisRunner(recommendation_generator.for_analysis()).run_analysis(url, analysis_id)
+
+# A fixed number of analyses run at once (SEOLYZER_WORKERS); a bounded number wait (SEOLYZER_MAX_QUEUED)
+jobs = JobQueue(run_job)
+
+def heartbeat():
+    """Keep the claims of this process' queued and running analyses alive while it is up"""
+    while True:
+        time.sleep(analysis_status.lease / 4)
+        try:
+            analysis_status.touch(jobs.job_ids())
+        except Exception as e:
+            logger.warning(f"Status heartbeat failed: {str(e)}")
+
+threading.Thread(target=heartbeat, name="seo-status-heartbeat", daemon=True).start()
+
+def status_stream(analysis_id, version=0):
+    """Server-Sent Events of an analysis' status from the status store, until it finishes"""
+    while True:
+        status, current = analysis_status.wait_for_change(analysis_id, version, MAX_STATUS_WAIT)
+        if status is None:
+            return
+        if current == version:
+            yield ": keepalive\n\n"
+            continue
+        version = current
+        data = {key: status[key] for key in EVENT_STATUS_FIELDS if key in status}
+        yield f"id: {version}\nevent: status\ndata: {json.dumps(data)}\n\n"
+        if status.get('status') in FINISHED_STATES:
+            return
 
 @app.route('/')
 def index():
@@ -147,48 +262,157 @@ def start_analysis():
         url = 'https://' + url
         
     # Generate unique analysis ID
-    analysis_id = f"analysis_{int(time.time())}"
+    analysis_id = f"analysis_{uuid.uuid4().hex}"
     
+    # Answer from a recent analysis of the same site and settings unless asked to re-run
+    cached = result_cache.lookup(url, result_config, force=bool(data.get('force'))) if result_cache else None
+    if cached:
+        # The report is served from the cache itself, not copied per hit
+        cache_key, meta = cached
+        analysis_status.set(analysis_id, {
+            'status': 'completed',
+            'progress': 100,
+            'message': 'Analysis complete (recent result)!',
+            'report_cache_key': cache_key,
+            'end_time': datetime.now().isoformat(),
+            'pages_analyzed': meta['pages_analyzed'],
+            'cached_at': datetime.fromtimestamp(meta['stored_at']).isoformat()
+        })
+        logger.info(f"Serving cached analysis of {url} as {analysis_id}")
+        return jsonify({
+            'analysis_id': analysis_id,
+            'status': 'completed',
+            'cached': True,
+            'pages_analyzed': meta['pages_analyzed'],
+            'message': 'Analysis complete (recent result)!'
+        })
+        
     # Initialize analysis status
-    analysis_status[analysis_id] = {
-        'status': 'starting',
+    analysis_status.set(analysis_id, {
+        'status': 'queued',
         'progress': 0,
-        'message': 'Initializing analysis...',
+        'message': 'Waiting for a free analysis slot...',
         'url': url
-    }
+    })
     
-    # Start analysis in background thread
-    analyzer = SEOAnalysisRunner()
-    thread = threading.Thread(
-        target=analyzer.run_analysis, 
-        args=(url, analysis_id)
-    )
-    thread.daemon = True
-    thread.start()
+    # Join an analysis of the same site that is already queued or running (in any process)
+    owner_id = analysis_status.claim(normalize_url(url), analysis_id)
+    if owner_id != analysis_id:
+        analysis_status.delete(analysis_id)
+        logger.info(f"Attaching request for {url} to running analysis {owner_id}")
+        return jsonify({
+            'analysis_id': owner_id,
+            'status': 'attached',
+            'message': 'Joined an analysis of this website that is already in progress'
+        })
+    
+    events.open(analysis_id)
+    
+    # Queue the analysis for the worker pool, or turn it away while saturated
+    try:
+        position = jobs.submit(analysis_id, url)
+    except QueueFull as e:
+        analysis_status.delete(analysis_id)
+        events.close(analysis_id)
+        response = jsonify({'error': str(e), 'retry_after': e.retry_after})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 503
+        
+    set_queue_position(analysis_id, position)
     
     return jsonify({
         'analysis_id': analysis_id,
-        'status': 'started',
-        'message': 'Analysis started successfully'
+        'status': 'queued',
+        'queue_position': position,
+        'message': 'Analysis queued successfully'
     })
 
 @app.route('/status/<analysis_id>')
 def get_status(analysis_id):
-    """Get analysis status"""
-    status = analysis_status.get(analysis_id, {
-        'status': 'not_found',
-        'message': 'Analysis not found'
+    """Get analysis status.
+    
+    Responses carry the status version as ETag (If-None-Match gets 304 while nothing
+    changed). With ?wait=<seconds>&version=<n> the request long-polls: it returns as
+    soon as the status moves past version n, or after the wait with the same status.
+    """
+    status, version = analysis_status.get_versioned(analysis_id)
+    if status is None:
+        return jsonify({
+            'status': 'not_found',
+            'message': 'Analysis not found'
+        })
+        
+    wait = min(request.args.get('wait', 0, type=float), MAX_STATUS_WAIT)
+    if wait > 0 and status.get('status') not in FINISHED_STATES:
+        known = request.args.get('version', type=int)
+        if known is None and request.if_none_match:
+            known = version if request.if_none_match.contains(str(version)) else None
+        if known == version:
+            status, version = analysis_status.wait_for_change(analysis_id, version, wait)
+            if status is None:
+                return jsonify({'status': 'not_found', 'message': 'Analysis not found'})
+                
+    response = jsonify(dict(status, version=version))
+    response.set_etag(str(version))
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+@app.route('/stats')
+def cache_stats():
+    """Result and LLM cache hit/miss counts plus worker pool load, for capacity planning"""
+    llm_cache = recommendation_generator.cache
+    return jsonify({
+        'result_cache': result_cache.stats() if result_cache else None,
+        'llm_cache': llm_cache.stats() if llm_cache else None,
+        'jobs': jobs.stats()
     })
-    return jsonify(status)
+
+@app.route('/jobs')
+def job_stats():
+    """Worker pool load: running and queued analyses, completed and rejected totals"""
+    return jsonify(jobs.stats())
+
+@app.route('/events/<analysis_id>')
+def stream_events(analysis_id):
+    """Stream status updates, finished pages and recommendation tokens (Server-Sent Events)
+    
+    Analyses running in another server process only have their status updates,
+    followed through the shared status store.
+    """
+    # Browsers send Last-Event-ID when reconnecting; replay only what they missed
+    last_id = request.headers.get('Last-Event-ID', '0')
+    last_id = int(last_id) if last_id.isdigit() else 0
+    
+    if events.exists(analysis_id):
+        stream = events.stream(analysis_id, last_id, keepalive=MAX_STATUS_WAIT)
+    elif analysis_status.get(analysis_id):
+        stream = status_stream(analysis_id, last_id)
+    else:
+        return jsonify({'status': 'not_found', 'message': 'Analysis not found'}), 404
+        
+    return Response(
+        stream,
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def cached_report(status):
+    """HTML of a report answered from the result cache, or None"""
+    cache_key = status.get('report_cache_key')
+    return result_cache.report(cache_key) if cache_key and result_cache else None
 
 @app.route('/report/<analysis_id>')
 def view_report(analysis_id):
     """View the generated report"""
-    status = analysis_status.get(analysis_id, {})
+    status = analysis_status.get(analysis_id) or {}
     
     if status.get('status') != 'completed':
         return redirect(url_for('index'))
         
+    report_html = cached_report(status)
+    if report_html:
+        return Response(report_html, mimetype='text/html')
+        
     report_path = status.get('report_path')
     if report_path and os.path.exists(report_path):
         return send_file(report_path)
@@ -198,11 +422,19 @@ def view_report(analysis_id):
 @app.route('/download/<analysis_id>')
 def download_report(analysis_id):
     """Download the report"""
-    status = analysis_status.get(analysis_id, {})
+    status = analysis_status.get(analysis_id) or {}
     
     if status.get('status') != 'completed':
         return jsonify({'error': 'Analysis not completed'}), 400
         
+    report_html = cached_report(status)
+    if report_html:
+        return Response(
+            report_html,
+            mimetype='text/html',
+            headers={'Content-Disposition': f'attachment; filename=seolyzer_report_{analysis_id}.html'}
+        )
+        
     report_path = status.get('report_path')
     if report_path and os.path.exists(report_path):
         return send_file(
@@ -0,0 +1,214 @@
+# benchmark.py - CPU cost of the per-page crawl and extraction work
+
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from bs4 import BeautifulSoup
+from seo_parsers import PARSER_BACKENDS, get_parser_backend, scan_links
+from seo_extractor import SEOExtractor, ParallelExtractor
+
+# The extractor logs every page; keep the benchmark output readable
+logging.disable(logging.INFO)
+
+
+# Small pages exercising the edge cases extraction has to agree on across parser
+# backends: entities, comments, fragments, XHTML, upper-case markup, JSON-LD lists...
+# (Badly malformed markup is deliberately absent: each parser recovers from it
+# differently, e.g. lxml keeps "<b>" inside an unclosed <title>.)
+FIXTURE_PAGES = {
+    'fixture://no-title-meta-title': '<html><head><meta name="title" content=" Meta Title "></head><body><p>Hello world</p></body></html>',
+    'fixture://entities': '<title>Fish &amp; Chips &nbsp; Shop</title><meta name="description" content="Caf&eacute; &lt;b&gt;"><h1>Caf&eacute;&nbsp;Menu</h1><p>a&nbsp;b c</p>',
+    'fixture://fragment': '<h1>Only a fragment</h1> some words here',
+    'fixture://empty': '',
+    'fixture://comments': '<html><!-- <title>Hidden</title> --><title>Real</title><body><!-- comment words --><p>visible words</p></body></html>',
+    'fixture://microdata-rdfa': '<div itemscope itemtype="http://schema.org/Product"><span itemscope>x</span></div><div typeof="foaf:Person">y</div><div vocab="x" typeof="">z</div>',
+    'fixture://json-ld-list': '<script type="application/ld+json">[{"@type":"A"},{"@type":"B"}]</script><script type="application/ld+json">{bad json</script><p>w</p>',
+    'fixture://json-ld-in-header': '<header><script type="application/ld+json">{"@type":"WebSite"}</script><span itemscope itemtype="t">x</span></header><main>main words</main>',
+    'fixture://padded-title': '<title>  Spaced title \n</title><meta name="description" content="">',
+    'fixture://svg-title': '<head><title>First</title></head><body><svg><title>Svg title</title></svg><title>Second</title></body>',
+    'fixture://table': '<table><tr><td>cell one</td><td>cell two</td></tr></table><p>after</p>',
+    'fixture://noscript-template': '<noscript>enable js words</noscript><template><p>tpl words</p></template><p>body</p>',
+    'fixture://xhtml': '<?xml version="1.0" encoding="utf-8"?><!DOCTYPE html><html xmlns="http://www.w3.org/1999/xhtml"><head><title>XHTML</title></head><body><h1>X</h1><a href="/x">x</a></body></html>',
+    'fixture://upper-case': '<HTML><HEAD><TITLE>Upper</TITLE><META NAME="description" CONTENT="Up desc"></HEAD><BODY><H1>Big</H1></BODY></HTML>',
+    'fixture://inline-breaks': '<style>p{}</style><p>one <br> two<br/>three</p><pre>  pre   text </pre>',
+}
+
+
+def available_backends():
+    """Return the names of the parser backends that can be used in this environment."""
+    names = []
+    for name in PARSER_BACKENDS:
+        try:
+            get_parser_backend(name)
+        except ValueError:
+            continue
+        names.append(name)
+    return names
+
+
+def sample_pages(count):
+    """Build a synthetic corpus of content pages with navigation, links and structured data."""
+    pages = {}
+    for n in range(count):
+        nav = ''.join(f'<li><a href="/section-{i}/">Section {i}</a></li>' for i in range(25))
+        paragraphs = ''.join(
+            f'<p>Paragraph {i} of page {n} with some <strong>body copy</strong>, '
+            f'an <a href="/page-{(n + i) % count}?ref=body&amp;utm=x">inline link</a> '
+            f'and enough words to look like a real article about topic {i}.</p>'
+            for i in range(60)
+        )
+        pages[f'https://example.com/page-{n}'] = f"""<!DOCTYPE html>
+<html lang="en"><head>
+<meta charset="utf-8"><title>Example page {n} | Example Co</title>
+<meta name="description" content="A description for example page {n}.">
+<script type="application/ld+json">{{"@context": "https://schema.org", "@type": "Article"}}</script>
+<style>body {{ font-family: sans-serif; }}</style>
+</head><body>
+<header><nav><ul>{nav}</ul></nav></header>
+<main itemscope itemtype="https://schema.org/Article"><h1>Example page {n}</h1>{paragraphs}</main>
+<footer><p>Footer text</p><a href="/contact">Contact</a></footer>
+<script>window.analytics = {{"page": {n}}};</script>
+</body></html>"""
+    return pages
+
+
+def load_pages(paths):
+    """Read HTML files (or every *.html file in the given directories) into a URL -> HTML dict."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.html'))))
+        else:
+            files.append(path)
+
+    pages = {}
+    for filename in files:
+        with open(filename, encoding='utf-8', errors='replace') as f:
+            pages[f'file://{os.path.abspath(filename)}'] = f.read()
+    return pages
+
+
+def cpu_per_page(func, pages, repeat):
+    """Return the best-of-`repeat` CPU seconds per page spent in func(url, html)."""
+    best = None
+    for _ in range(repeat):
+        started = time.process_time()
+        for url, html_content in pages.items():
+            func(url, html_content)
+        elapsed = time.process_time() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(pages)
+
+
+def bench_parse_once(pages, repeat):
+    """Compare parsing each page twice (crawler + extractor) with link scanning + one parse."""
+    extractor = SEOExtractor()
+
+    def before(url, html_content):
+        # Previous behaviour: a full BeautifulSoup tree for link discovery, then another in the extractor
+        BeautifulSoup(html_content, 'html.parser').find_all('a', href=True)
+        extractor.extract_seo_data(url, html_content)
+
+    def after(url, html_content):
+        scan_links(html_content)
+        extractor.extract_seo_data(url, html_content)
+
+    before_cpu = cpu_per_page(before, pages, repeat)
+    after_cpu = cpu_per_page(after, pages, repeat)
+
+    print(f"Pages: {len(pages)} (best of {repeat} runs)")
+    print(f"{'Crawl + extract path':<32}{'CPU ms/page':>12}")
+    print(f"{'before: two full parses':<32}{before_cpu * 1000:>12.2f}")
+    print(f"{'after: link scan + one parse':<32}{after_cpu * 1000:>12.2f}")
+    print(f"Speed-up: {before_cpu / after_cpu:.2f}x")
+
+
+def bench_parsers(pages, repeat):
+    """Measure extraction + link discovery throughput (pages/sec) for each parser backend."""
+    print(f"Pages: {len(pages)} (best of {repeat} runs)")
+    print(f"{'Backend':<14}{'CPU ms/page':>12}{'pages/sec':>12}")
+    for name in available_backends():
+        extractor = SEOExtractor(parser=name)
+
+        def crawl_and_extract(url, html_content):
+            extractor.parser.links(html_content)
+            extractor.extract_seo_data(url, html_content)
+
+        cpu = cpu_per_page(crawl_and_extract, pages, repeat)
+        print(f"{name:<14}{cpu * 1000:>12.2f}{1 / cpu:>12.1f}")
+
+
+def bench_parity(pages, repeat):
+    """Check that every parser backend produces identical extract_seo_data output and links."""
+    corpus = dict(FIXTURE_PAGES)
+    corpus.update(pages)
+    backends = available_backends()
+    reference_name = backends[0]
+    reference = SEOExtractor(parser=reference_name)
+
+    mismatches = 0
+    for name in backends[1:]:
+        candidate = SEOExtractor(parser=name)
+        for url, html_content in corpus.items():
+            expected = reference.extract_seo_data(url, html_content)
+            actual = candidate.extract_seo_data(url, html_content)
+            if expected != actual:
+                mismatches += 1
+                print(f"MISMATCH ({reference_name} vs {name}) {url}")
+                print(f"  {reference_name}: {json.dumps(expected)}")
+                print(f"  {name}: {json.dumps(actual)}")
+            if reference.parser.links(html_content) != candidate.parser.links(html_content):
+                mismatches += 1
+                print(f"LINK MISMATCH ({reference_name} vs {name}) {url}")
+
+    print(f"Compared {len(corpus)} pages across backends: {', '.join(backends)}")
+    if mismatches:
+        print(f"{mismatches} mismatches")
+        sys.exit(1)
+    print("All backends agree.")
+
+
+def bench_workers(pages, repeat):
+    """Measure wall-clock extraction throughput of the process pool for 1..N workers."""
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)) | {cpus})
+    print(f"Pages: {len(pages)} (best of {repeat} runs, {cpus} CPUs)")
+    print(f"{'Workers':<10}{'seconds':>10}{'pages/sec':>12}{'speed-up':>10}")
+    baseline = None
+    for workers in counts:
+        extractor = ParallelExtractor(workers=workers)
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            results = extractor.extract_all(pages)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        assert len(results) == len(pages)
+        baseline = baseline or best
+        print(f"{workers:<10}{best:>10.2f}{len(pages) / best:>12.1f}{baseline / best:>9.2f}x")
+
+
+BENCHMARKS = {
+    'parse-once': bench_parse_once,
+    'parsers': bench_parsers,
+    'parity': bench_parity,
+    'workers': bench_workers,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SEOlyzer's per-page CPU cost.")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('paths', nargs='*', help="HTML files or directories (default: synthetic pages)")
+    parser.add_argument('--pages', type=int, default=50, help="number of synthetic pages")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    corpus = load_pages(args.paths) if args.paths else sample_pages(args.pages)
+    if not corpus:
+        parser.error("no HTML pages found")
+    BENCHMARKS[args.benchmark](corpus, args.repeat)
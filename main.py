@@ -3,8 +3,8 @@
 import os
 import json
 import logging
-from seo_crawler import SEOCrawler
-from seo_extractor import SEOExtractor
+from seo_pipeline import SEOPipeline
+from seo_analyzer import SEOAnalyzer
 from seo_recommendation import SEORecommendationGenerator
 from seo_report_generator import SEOReportGenerator
 
@@ -16,40 +16,29 @@ def run_seo_analysis(url):
     """Run a complete SEO analysis on the given URL."""
     logger.info("Starting SEO analysis")
     
-    # Step 1: Crawl the website
-    logger.info("Step 1: Crawling website")
-    crawler = SEOCrawler()
-    crawled_pages = crawler.crawl(url)
+    recommendation_generator = SEORecommendationGenerator()
+    if recommendation_generator.mode == "batch":
+        # Offline audits: crawl and extract first, then send every page in one Batch API job
+        logger.info("Steps 1-2: Crawling website and extracting SEO data")
+        seo_data = SEOAnalyzer().analyze(url) or {}
+        logger.info("Step 3: Generating SEO recommendations (batch)")
+        results_with_recommendations = recommendation_generator.process_website_data(seo_data)
+    else:
+        # Steps 1-3: Crawl, extract SEO data and generate recommendations, overlapped
+        # so each page moves on to the next stage as soon as it is ready
+        logger.info("Steps 1-3: Crawling, extracting and generating SEO recommendations")
+        pipeline = SEOPipeline(recommendation_generator=recommendation_generator)
+        results_with_recommendations = pipeline.run(url)
     
-    if not crawled_pages:
+    if not results_with_recommendations:
         logger.error("Crawling failed. Exiting.")
         return
         
-    # Step 2: Extract SEO data
-    logger.info("Step 2: Extracting SEO data")
-    extractor = SEOExtractor()
-    seo_data = {}
-    
-    for page_url, html_content in crawled_pages.items():
-        page_data = extractor.extract_seo_data(page_url, html_content)
-        seo_data[page_url] = page_data
-        
     # Save raw SEO data
+    seo_data = {page_url: result["seo_data"] for page_url, result in results_with_recommendations.items()}
     with open("seo_analysis_results.json", "w") as f:
         json.dump(seo_data, f, indent=4)
         
-    # Step 3: Generate recommendations
-    logger.info("Step 3: Generating SEO recommendations")
-    recommendation_generator = SEORecommendationGenerator()
-    results_with_recommendations = {}
-    
-    for url, page_data in seo_data.items():
-        recommendations = recommendation_generator.generate_recommendations(page_data)
-        results_with_recommendations[url] = {
-            "seo_data": page_data,
-            "recommendations": recommendations.get("recommendations", "Error generating recommendations")
-        }
-        
     # Save results with recommendations
     with open("seo_results_with_recommendations.json", "w") as f:
         json.dump(results_with_recommendations, f, indent=4)
@@ -1,8 +1,11 @@
 # seo_analyzer.py
 #sk-eff22960284b4ae78a7606c9441a45bc
 
-from seo_crawler import SEOCrawler
-from seo_extractor import SEOExtractor
+from seo_crawler import SEOCrawler, iterate_async
+from seo_page_store import DiskPageStore, NullPageStore
+from seo_extractor import ParallelExtractor
+import asyncio
+import contextlib
 import json
 import logging
 import time
@@ -13,8 +16,8 @@ logger = logging.getLogger(__name__)
 class SEOAnalyzer:
     def __init__(self):
         """Initialize the SEO analyzer with crawler and extractor."""
-        self.crawler = SEOCrawler()
-        self.extractor = SEOExtractor()
+        self.crawler = SEOCrawler()  # Each run gives it a fresh page store, closed when the run ends
+        self.extractor = ParallelExtractor()
         self.results = {}
         
     def analyze(self, url):
@@ -22,24 +25,56 @@ class SEOAnalyzer:
         logger.info(f"Starting SEO analysis for: {url}")
         start_time = time.time()
         
-        # Step 1: Crawl the website
-        crawled_pages = self.crawler.crawl(url)
+        # Step 1: Crawl the website into a compressed temp file, read back by the extractor
+        self.crawler.pages_data = DiskPageStore()
+        crawled_pages = self.crawler.crawl_concurrent(url)
         
         if not crawled_pages:
             logger.error("Crawling failed. No pages were collected.")
+            crawled_pages.close()
             return None
             
-        # Step 2: Extract SEO data from each page
-        for page_url, html_content in crawled_pages.items():
-            logger.info(f"Analyzing SEO data for: {page_url}")
-            seo_data = self.extractor.extract_seo_data(page_url, html_content)
-            self.results[page_url] = seo_data
+        # Step 2: Extract SEO data from each page (spread over a process pool)
+        logger.info(f"Analyzing SEO data for {len(crawled_pages)} pages with {self.extractor.workers} workers")
+        self.results.update(self.extractor.extract_all(crawled_pages))
+        crawled_pages.close()
         
         elapsed_time = time.time() - start_time
         logger.info(f"SEO analysis complete. Analyzed {len(self.results)} pages in {elapsed_time:.2f} seconds.")
         
         return self.results
     
+    def analyze_iter(self, url):
+        """Yield (page_url, seo_data) for each page as soon as it has been crawled and extracted.
+
+        Unlike analyze(), results are not kept in self.results; stop iterating to end
+        the crawl early.
+        """
+        return iterate_async(self.analyze_aiter(url))
+
+    async def analyze_aiter(self, url):
+        """Async version of analyze_iter, for use with `async for`."""
+        logger.info(f"Starting streaming SEO analysis for: {url}")
+        start_time = time.time()
+        analyzed = 0
+        # Pages go straight to the extractor, so the crawler keeps only their URLs
+        self.crawler.pages_data = NullPageStore()
+
+        try:
+            # aclosing: stopping early closes the crawl (cancelling its pending fetches)
+            # before the page store it writes to is closed below
+            async with contextlib.aclosing(self.crawler.aiter_crawl(url)) as pages:
+                async for page_url, html_content in pages:
+                    # Extraction runs in the pool (or in-process with one worker) while fetches continue
+                    seo_data = await asyncio.wrap_future(self.extractor.submit(page_url, html_content))
+                    analyzed += 1
+                    yield page_url, seo_data
+        finally:
+            self.extractor.close()
+            self.crawler.pages_data.close()
+            elapsed_time = time.time() - start_time
+            logger.info(f"Streaming SEO analysis finished. Analyzed {analyzed} pages in {elapsed_time:.2f} seconds.")
+
     def save_results(self, filename='seo_analysis_results.json'):
         """Save the analysis results to a JSON file."""
         if not self.results:
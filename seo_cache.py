@@ -0,0 +1,268 @@
+# seo_cache.py
+
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+import time
+import logging
+from seo_frontier import normalize_url
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, ttl=None):
+        """Initialize a persistent key/value cache in a SQLite file with size-bounded LRU eviction.
+
+        With a `ttl` (seconds), entries older than that are treated as misses and dropped.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value BLOB, meta TEXT, size INTEGER,"
+            " created REAL, accessed REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._conn.commit()
+
+    def get(self, key, record=True):
+        """Return (value, meta) for a key, or None on a miss.
+
+        With record=False the read doesn't count as a hit or miss.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value, meta, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += record
+                return None
+            now = time.time()
+            if self.ttl is not None and now - row[2] > self.ttl:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.expired += 1
+                self.misses += record
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += record
+        return row[0], json.loads(row[1])
+
+    def set(self, key, value, meta=None):
+        """Store a value (bytes) with JSON-serializable metadata, evicting old entries if needed."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, meta, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, json.dumps(meta or {}), len(value), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key):
+        """Remove a key from the cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def total_bytes(self):
+        """Return the size of all cached values."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self):
+        """Return hit/miss counters for this cache instance."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'expired': self.expired,
+            'entries': len(self),
+            'bytes': self.total_bytes(),
+        }
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class ResultCache:
+    def __init__(self, cache_dir, ttl=3600, max_bytes=256 * 1024 * 1024):
+        """Initialize an on-disk cache of finished analyses (the rendered report), keyed by
+        normalized start URL and the pipeline settings that produced it."""
+        self.store = DiskCache(os.path.join(cache_dir, "result_cache.sqlite3"), max_bytes, ttl=ttl)
+        self.bypassed = 0  # Lookups skipped on request (force)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url, config):
+        """Hash the normalized start URL together with the pipeline settings."""
+        material = json.dumps({'url': normalize_url(url), 'config': config}, sort_keys=True)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def lookup(self, url, config, force=False):
+        """Return (key, meta) for a cached analysis, or None (always None with force).
+
+        The report itself is read with report(key) when it is viewed.
+        """
+        if force:
+            with self._lock:
+                self.bypassed += 1
+            return None
+        key = self.key(url, config)
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        return key, entry[1]
+
+    def report(self, key):
+        """Return the cached report HTML for a key from lookup(), or None once it has expired."""
+        entry = self.store.get(key, record=False)
+        return entry[0].decode('utf-8') if entry else None
+
+    def save(self, url, config, report_html, pages_analyzed):
+        """Cache a finished analysis' report."""
+        meta = {'url': url, 'pages_analyzed': pages_analyzed, 'stored_at': time.time()}
+        self.store.set(self.key(url, config), report_html.encode('utf-8'), meta)
+
+    def stats(self):
+        """Return cache counters, including lookups bypassed with force."""
+        stats = self.store.stats()
+        stats['bypassed'] = self.bypassed
+        return stats
+
+
+class HTTPCache:
+    def __init__(self, cache_dir, max_bytes=256 * 1024 * 1024):
+        """Initialize an on-disk HTTP response cache used for conditional recrawls."""
+        self.store = DiskCache(os.path.join(cache_dir, "http_cache.sqlite3"), max_bytes)
+        self.revalidated = 0  # 304 responses answered from the cache
+        self.refreshed = 0  # Cached entries replaced by a full 200 response
+        self.bytes_saved = 0
+        self.seconds_saved = 0.0
+        self._lock = threading.Lock()
+
+    def lookup(self, url):
+        """Return the cached (html, meta) for a URL, or None."""
+        entry = self.store.get(normalize_url(url))
+        if entry is None:
+            return None
+        body, meta = entry
+        return body.decode('utf-8'), meta
+
+    def conditional_headers(self, entry):
+        """Build If-None-Match / If-Modified-Since headers for a cached entry."""
+        if entry is None:
+            return {}
+        _, meta = entry
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def save(self, url, headers, html_content, fetch_seconds, replaced=False):
+        """Cache an HTML response if it carries a validator we can revalidate with."""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetch_seconds': fetch_seconds,
+            'stored_at': time.time(),
+        }
+        self.store.set(normalize_url(url), html_content.encode('utf-8'), meta)
+        if replaced:
+            with self._lock:
+                self.refreshed += 1
+
+    def record_not_modified(self, entry, fetch_seconds):
+        """Account for a 304 that let us reuse the cached body."""
+        html_content, meta = entry
+        with self._lock:
+            self.revalidated += 1
+            self.bytes_saved += len(html_content.encode('utf-8'))
+            self.seconds_saved += max(0.0, meta.get('fetch_seconds', 0.0) - fetch_seconds)
+
+    def stats(self):
+        """Return cache counters, including bandwidth and time saved by revalidation."""
+        stats = self.store.stats()
+        stats.update({
+            'revalidated': self.revalidated,
+            'refreshed': self.refreshed,
+            'bytes_saved': self.bytes_saved,
+            'seconds_saved': round(self.seconds_saved, 3),
+        })
+        return stats
+
+
+class LLMCache:
+    def __init__(self, cache_dir, ttl=7 * 24 * 3600, max_bytes=64 * 1024 * 1024):
+        """Initialize an on-disk cache of LLM responses, addressed by a hash of the request."""
+        self.store = DiskCache(os.path.join(cache_dir, "llm_cache.sqlite3"), max_bytes, ttl=ttl)
+        self.seconds_saved = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(request):
+        """Hash everything that determines the response: model, messages, temperature, max_tokens..."""
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def lookup(self, request):
+        """Return the cached response text for a request, or None."""
+        entry = self.store.get(self.key(request))
+        if entry is None:
+            return None
+        content, meta = entry
+        with self._lock:
+            self.seconds_saved += meta.get('seconds', 0.0)
+        return content.decode('utf-8')
+
+    def save(self, request, content, seconds):
+        """Cache a response along with how long it took to generate."""
+        meta = {'model': request.get('model'), 'seconds': seconds, 'stored_at': time.time()}
+        self.store.set(self.key(request), content.encode('utf-8'), meta)
+
+    def stats(self):
+        """Return cache counters, including the API time saved by hits."""
+        stats = self.store.stats()
+        stats['seconds_saved'] = round(self.seconds_saved, 3)
+        return stats
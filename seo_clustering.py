@@ -0,0 +1,137 @@
+# seo_clustering.py
+
+import threading
+import logging
+from collections import OrderedDict
+from urllib.parse import urlparse
+from seo_scoring import NO_TITLE, NO_DESCRIPTION, TITLE_LENGTH, DESCRIPTION_LENGTH
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+MIN_QUOTE_LENGTH = 4  # Shorter titles/headings are too generic to count as quoted page text
+
+
+def length_band(text, placeholder, bounds):
+    """Classify a text field as 'missing', 'short', 'ok' or 'long' against (low, high) bounds."""
+    if not text or text == placeholder:
+        return 'missing'
+    low, high = bounds
+    if len(text) < low:
+        return 'short'
+    if len(text) > high:
+        return 'long'
+    return 'ok'
+
+
+def issue_signature(seo_data, scorer):
+    """Key pages that would get the same recommendations: same check results, same page shape.
+
+    Pages built from one template typically share their failed checks, H1 layout,
+    structured data types and order of magnitude of content, even though titles
+    and URLs differ. Length problems keep their direction, so a too-short and a
+    too-long title (same check score) don't share advice.
+    """
+    checks = scorer.score_page(seo_data)['checks']
+    return (
+        tuple(sorted(checks.items())),
+        length_band(seo_data.get('meta_title'), NO_TITLE, TITLE_LENGTH),
+        length_band(seo_data.get('meta_description'), NO_DESCRIPTION, DESCRIPTION_LENGTH),
+        min(seo_data.get('h1_tags', {}).get('count', 0), 2),  # none, one, several
+        seo_data.get('word_count', 0).bit_length(),  # Word-count bucket: 64-127, 128-255, ...
+        tuple(seo_data.get('structured_data', {}).get('summary', [])),
+    )
+
+
+def cluster_pages(seo_data_dict, scorer):
+    """Group URLs by issue signature, keeping first-seen order: [[url, ...], ...]."""
+    clusters = OrderedDict()
+    for url, seo_data in seo_data_dict.items():
+        clusters.setdefault(issue_signature(seo_data, scorer), []).append(url)
+    return list(clusters.values())
+
+
+def _page_quotes(seo_data):
+    """Lower-cased URL, title, description and H1s of a page: text only true of that page."""
+    texts = [seo_data.get('url'), seo_data.get('meta_title'), seo_data.get('meta_description')]
+    texts += seo_data.get('h1_tags', {}).get('contents', [])
+    return [text.lower() for text in texts
+            if text and text not in (NO_TITLE, NO_DESCRIPTION) and len(text) >= MIN_QUOTE_LENGTH]
+
+
+def fan_out(result, representative, score):
+    """Reuse a cluster representative's result (representative = its seo_data) for another page.
+
+    No LLM call is made for the page: it gets the representative's generic advice
+    and its own rule-based `score` (SEOScorer), as pages that pass every check do.
+    Advice quoting the representative's URL, title, description or H1 is left
+    out, since it describes that page; the receiving page's own check failures are
+    reported by the scorer.
+    """
+    recommendations = result.get("recommendations")
+    if not isinstance(recommendations, dict):
+        return result
+    quotes = _page_quotes(representative)
+
+    def generic(text):
+        return isinstance(text, str) and not any(quote in text.lower() for quote in quotes)
+
+    shared = {field: [item for item in recommendations.get(field, []) if generic(item)]
+              for field in ("critical_issues", "content", "technical")}
+    quick_win = recommendations.get("quick_win")
+    return {"recommendations": dict(
+        shared,
+        score=score,
+        quick_win=quick_win if generic(quick_win) else None,
+        representative_url=representative['url'],
+    )}
+
+
+class _Cluster:
+    def __init__(self, representative):
+        self.representative = representative  # seo_data of the page sent to the LLM
+        self.done = threading.Event()
+        self.result = {"error": "Recommendation for this page template failed"}
+
+
+class TemplateClusters:
+    def __init__(self, scorer):
+        """Initialize single-flight deduplication of recommendations by issue signature.
+
+        For pages that arrive one at a time (e.g. from SEOPipeline threads): the first
+        page with a given signature is sent to the LLM, later ones wait for and reuse
+        its result.
+        """
+        self.scorer = scorer
+        self.llm_calls = 0
+        self.reused = 0
+        self._clusters = {}
+        self._lock = threading.Lock()
+
+    def recommend(self, seo_data, generate):
+        """Return generate(seo_data), or the result of an earlier page with the same signature."""
+        # Clusters never span sites, even when one generator serves several analyses
+        signature = (urlparse(seo_data['url']).netloc, issue_signature(seo_data, self.scorer))
+        with self._lock:
+            cluster = self._clusters.get(signature)
+            owner = cluster is None
+            if owner:
+                cluster = self._clusters[signature] = _Cluster(seo_data)
+                self.llm_calls += 1
+            else:
+                self.reused += 1
+
+        if owner:
+            try:
+                cluster.result = generate(seo_data)
+            finally:
+                cluster.done.set()
+            return cluster.result
+
+        cluster.done.wait()
+        logger.info(f"Reusing recommendations of {cluster.representative['url']} for {seo_data['url']}")
+        return fan_out(cluster.result, cluster.representative, self.scorer.score_page(seo_data)['score'])
+
+    def stats(self):
+        """Return how many pages were sent to the LLM and how many reused a cluster result."""
+        return {'clusters': len(self._clusters), 'llm_calls': self.llm_calls, 'reused': self.reused}
@@ -1,19 +1,55 @@
 # seo_crawler.py - improved version
 
 import requests
-from bs4 import BeautifulSoup
+import httpx
+import asyncio
 from urllib.parse import urljoin, urlparse
+import os
+import re
 import time
-import random
+from collections import Counter
 from requests.exceptions import RequestException
 import logging
+from seo_frontier import CrawlFrontier, normalize_url
+from seo_politeness import PolitenessScheduler
+from seo_cache import HTTPCache
+from seo_sitemap import SitemapReader
+from seo_page_store import MemoryPageStore
+from seo_parsers import get_parser_backend
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+SITEMAP_SCAN_FACTOR = 10  # Sitemap URLs read per seed slot before seeding stops looking
+
+
+def iterate_async(async_iterator):
+    """Iterate an async generator from synchronous code on a private event loop.
+
+    The loop only runs while the next item is being produced, so background work
+    (e.g. in-flight fetches) pauses while the caller handles an item. Closing the
+    returned generator closes the async generator.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(async_iterator.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(async_iterator.aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
+
 class SEOCrawler:
-    def __init__(self, user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'):
+    def __init__(self, user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                 max_concurrency=8, max_per_host=4, bloom_capacity=None, full_speed_hosts=None,
+                 cache_dir=None, cache_max_bytes=256 * 1024 * 1024, use_sitemaps=True,
+                 max_page_bytes=5 * 1024 * 1024, page_store=None, parser=None, on_page=None):
         """Initialize the crawler with more realistic user agent."""
         self.session = requests.Session()
         self.session.headers.update({
@@ -24,110 +60,470 @@ class SEOCrawler:
             'Pragma': 'no-cache',
         })
         self.visited_urls = set()
-        self.pages_data = {}
+        # Crawled HTML by URL; pass a DiskPageStore to keep pages off the heap
+        self.pages_data = page_store if page_store is not None else MemoryPageStore()
+        # Optional on_page(url, html) hook called as each page is stored, so later
+        # stages (see seo_pipeline) can start before the crawl finishes
+        self.on_page = on_page
+        # HTML parser backend used for link discovery (see seo_parsers)
+        self.parser = get_parser_backend(parser)
         self.max_pages = 10
         self.timeout = 15  # Increased timeout
-        
+        self.max_retries = 3
+        self.max_page_bytes = max_page_bytes  # Abort downloads of pages larger than this
+        self.stats = Counter()  # Fetch outcomes: pages, aborted_non_html, aborted_oversized, ...
+
+        # Concurrent crawl limits (used by crawl_async / crawl_concurrent)
+        self.max_concurrency = max_concurrency  # In-flight requests overall
+        self.max_per_host = max_per_host  # In-flight requests per host
+        self._host_semaphores = {}
+
+        # Frontier dedupe: an exact set by default, a Bloom filter sized for
+        # bloom_capacity URLs when crawling very large sites
+        self.bloom_capacity = bloom_capacity
+        self.frontier = None
+
+        # Seed the frontier from robots.txt Sitemap: lines and /sitemap.xml.
+        # Only the best sitemap_seed_limit entries (default 2 x max_pages) are kept,
+        # chosen from the first SITEMAP_SCAN_FACTOR x that many sitemap URLs read.
+        self.use_sitemaps = use_sitemaps
+        self.sitemap_seed_limit = None
+        self.page_metadata = {}  # Sitemap lastmod/priority for crawled pages
+
+        # Per-host politeness: robots.txt rules, Crawl-delay and adaptive rate limiting.
+        # Hosts we own can be whitelisted for full-speed crawling.
+        self.scheduler = PolitenessScheduler(user_agent=user_agent, target_concurrency=max_per_host)
+        if full_speed_hosts is None:
+            full_speed_hosts = os.getenv("SEOLYZER_FULL_SPEED_HOSTS", "").split(",")
+        for host in full_speed_hosts:
+            if host.strip():
+                self.scheduler.whitelist(host.strip())
+
+        # Opt-in persistent HTTP cache: recrawls send If-None-Match/If-Modified-Since
+        # and reuse the stored HTML on 304 Not Modified
+        if cache_dir is None:
+            cache_dir = os.getenv("SEOLYZER_HTTP_CACHE_DIR")
+        self.cache = HTTPCache(cache_dir, cache_max_bytes) if cache_dir else None
+        if self.cache:
+            # Let validators do their job instead of forcing a fresh copy every time
+            self.session.headers.pop('Cache-Control', None)
+            self.session.headers.pop('Pragma', None)
+
     def crawl(self, start_url):
         """Crawl the website starting from the given URL, collecting up to 10 pages."""
         logger.info(f"Starting crawl from: {start_url}")
 
-        def normalize_url(url):
-            url = url.rstrip('/')  # Remove trailing slash
-            url = url.split('#')[0]  # Remove fragments
-            url = url.split('?')[0]  # Remove query parameters
-            return url.lower()  # Case normalization (if server is case-insensitive)
-
-        if start_url.endswith('/'):
-            start_url = start_url[:-1]
-        parsed_url = urlparse(start_url)
-
-        # Normalize the start URL
-        parsed_url = urlparse(start_url)
-        base_domain = parsed_url.netloc
+        start_url, base_domain = self._prepare_start_url(start_url)
         if not base_domain:
             logger.error("Invalid URL provided")
             return {}
-        
-        # Ensure the URL has a scheme
-        if not parsed_url.scheme:
-            start_url = 'https://' + start_url
-            
-        # Queue for BFS crawling
-        queue = [start_url]
-        retry_count = 0
-        max_retries = 3
-        
+
+        self._load_robots(start_url)
+
+        # Frontier for BFS crawling
+        queue = self._new_frontier(start_url)
+        if self.use_sitemaps:
+            self._seed_from_sitemaps(queue, start_url, base_domain)
+        retries = {}
+
         while queue and len(self.pages_data) < self.max_pages:
-            current_url = queue.pop(0)
-            
-            # Skip if already visited
-            if current_url in self.visited_urls:
-                continue
-                
+            current_url = queue.pop()
             self.visited_urls.add(current_url)
-            
+
+            current_url, html_content, retry = self._fetch(current_url)
+            if retry:
+                self._schedule_retry(queue, retries, current_url)
+                continue
+            if html_content is None:
+                continue
+
             try:
-                # Respect crawl rate (be a good bot)
-                time.sleep(random.uniform(2.0, 3.0))
-                
-                logger.info(f"Crawling: {current_url}")
-                response = self.session.get(current_url, timeout=self.timeout)
-                
-                # Skip non-HTML responses and failed requests
-                if not response.ok:
-                    logger.warning(f"Got status code {response.status_code} for {current_url}")
-                    continue
-                    
-                if 'text/html' not in response.headers.get('Content-Type', ''):
-                    logger.warning(f"Not an HTML page: {current_url}")
-                    continue
-                    
-                # Parse the HTML content
-                html_content = response.text
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
                 # Store the page data
-                self.pages_data[current_url] = html_content
-                logger.info(f"Successfully crawled page {len(self.pages_data)}: {current_url}")
-                
+                self._store_page(current_url, html_content)
+                if self.on_page:
+                    self.on_page(current_url, html_content)
+
                 # Find all links on the page
                 if len(self.pages_data) < self.max_pages:
-                    links = soup.find_all('a', href=True)
-                    logger.info(f"Found {len(links)} links on {current_url}")
-                    
-                    for link in links:
-                        href = link['href']
-                        full_url = urljoin(current_url, href)
-                        full_url = normalize_url(full_url)  # <-- ADD THIS
-
-                        
-                        # Only follow links to the same domain
-                        parsed_href = urlparse(full_url)
-                        if parsed_href.netloc == base_domain and full_url not in self.visited_urls:
-                            # Exclude common non-content URLs
-                            if not self._should_exclude(full_url):
-                                queue.append(full_url)
-                
-            except RequestException as e:
-                logger.error(f"Error crawling {current_url}: {str(e)}")
-                retry_count += 1
-                if retry_count < max_retries:
-                    logger.info(f"Retrying... Attempt {retry_count}/{max_retries}")
-                    queue.insert(0, current_url)  # Put back at front of queue
-                    time.sleep(5)  # Wait before retry
-                else:
-                    logger.error(f"Max retries exceeded for {current_url}")
+                    queue.extend(self._extract_links(html_content, current_url, base_domain))
+
+            except Exception as e:
+                logger.error(f"Unexpected error: {str(e)}")
+
+        self._log_crawl_summary()
+        return self.pages_data
+
+    def crawl_concurrent(self, start_url):
+        """Run crawl_async from synchronous code and return the crawled pages."""
+        return asyncio.run(self.crawl_async(start_url))
+
+    async def crawl_async(self, start_url):
+        """Crawl the website with several requests in flight, collecting up to max_pages pages."""
+        async for _ in self.aiter_crawl(start_url):
+            pass
+        return self.pages_data
+
+    def iter_crawl(self, start_url):
+        """Crawl concurrently, yielding (url, html) for each page as soon as it is fetched.
+
+        Synchronous counterpart of aiter_crawl; stop iterating to end the crawl early.
+        """
+        return iterate_async(self.aiter_crawl(start_url))
+
+    async def aiter_crawl(self, start_url):
+        """Crawl concurrently, yielding (url, html) for each page as soon as it is fetched.
+
+        Fetches already in flight keep going while the caller handles a page. Closing
+        the generator (e.g. breaking out of `async for`) cancels them and ends the crawl.
+        """
+        logger.info(f"Starting concurrent crawl from: {start_url} "
+                    f"(max {self.max_concurrency} in flight, {self.max_per_host} per host)")
+
+        start_url, base_domain = self._prepare_start_url(start_url)
+        if not base_domain:
+            logger.error("Invalid URL provided")
+            return
+
+        self._host_semaphores = {}  # Semaphores belong to this crawl's event loop
+        retries = {}
+        pending = set()
+        limits = httpx.Limits(max_connections=self.max_concurrency,
+                              max_keepalive_connections=self.max_concurrency)
+
+        async with httpx.AsyncClient(headers=dict(self.session.headers), timeout=self.timeout,
+                                     follow_redirects=True, limits=limits) as client:
+            try:
+                await self._load_robots_async(client, start_url)
+                queue = self._new_frontier(start_url)
+                if self.use_sitemaps:
+                    await asyncio.to_thread(self._seed_from_sitemaps, queue, start_url, base_domain)
+
+                while queue or pending:
+                    # Dispatch as many requests as the concurrency limit and page budget allow
+                    while queue and len(pending) < self.max_concurrency and \
+                            len(self.pages_data) + len(pending) < self.max_pages:
+                        current_url = queue.pop()
+                        self.visited_urls.add(current_url)
+                        pending.add(asyncio.ensure_future(self._fetch_async(client, current_url)))
+
+                    if not pending:
+                        break
+
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        current_url, html_content, retry = task.result()
+
+                        if retry:
+                            self._schedule_retry(queue, retries, current_url)
+                            continue
+
+                        if html_content is None or len(self.pages_data) >= self.max_pages:
+                            continue
+
+                        self._store_page(current_url, html_content)
+                        if self.on_page:
+                            # Off the event loop: the hook may block to apply backpressure
+                            await asyncio.to_thread(self.on_page, current_url, html_content)
+
+                        if len(self.pages_data) < self.max_pages:
+                            queue.extend(self._extract_links(html_content, current_url, base_domain))
+
+                        yield current_url, html_content
+            finally:
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.wait(pending)
+
+        self._log_crawl_summary()
+
+    def _fetch(self, url):
+        """Fetch a single page, returning (url, html or None, whether to retry).
+
+        The response is streamed: status and headers are checked before any of the
+        body is read, and the download stops once it exceeds max_page_bytes.
+        """
+        host = urlparse(url).netloc
+
+        # Respect crawl rate (be a good bot)
+        time.sleep(self.scheduler.reserve(host))
+
+        try:
+            logger.info(f"Crawling: {url}")
+            cached = self.cache.lookup(url) if self.cache else None
+            started = time.monotonic()
+            with self.session.get(url, timeout=self.timeout, stream=True,
+                                  headers=self.cache.conditional_headers(cached) if cached else None) as response:
+                self.scheduler.record_response(host, response.status_code, time.monotonic() - started,
+                                               response.headers.get('Retry-After'))
+
+                action = self._classify_response(url, response.status_code, response.headers, cached)
+                if action != 'read':
+                    return self._unread_result(url, action, cached, time.monotonic() - started)
+
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    body.extend(chunk)
+                    if len(body) > self.max_page_bytes:
+                        return self._oversized_result(url, len(body))
+                elapsed = time.monotonic() - started
+        except RequestException as e:
+            logger.error(f"Error crawling {url}: {str(e)}")
+            self.stats['request_errors'] += 1
+            self.scheduler.record_error(host)
+            return url, None, True
+        except Exception as e:
+            logger.error(f"Unexpected error: {str(e)}")
+            return url, None, False
+
+        return url, self._finish_download(url, response.headers, body, elapsed, cached), False
+
+    async def _fetch_async(self, client, url):
+        """Fetch a single page, returning (url, html or None, whether to retry).
+
+        Like _fetch, headers are checked before the body is read and oversized
+        downloads are abandoned.
+        """
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.setdefault(host, asyncio.Semaphore(self.max_per_host))
+
+        async with semaphore:
+            # Respect crawl rate (be a good bot). Reserving once a per-host slot is free
+            # spaces requests by the delay adapted from the latest responses, rather
+            # than queueing every dispatched page behind the starting delay.
+            await asyncio.sleep(self.scheduler.reserve(host))
+            try:
+                logger.info(f"Crawling: {url}")
+                cached = self.cache.lookup(url) if self.cache else None
+                started = time.monotonic()
+                async with client.stream('GET', url,
+                                         headers=self.cache.conditional_headers(cached) if cached else None) as response:
+                    self.scheduler.record_response(host, response.status_code, time.monotonic() - started,
+                                                   response.headers.get('Retry-After'))
+
+                    action = self._classify_response(url, response.status_code, response.headers, cached)
+                    if action != 'read':
+                        return self._unread_result(url, action, cached, time.monotonic() - started)
+
+                    body = bytearray()
+                    async for chunk in response.aiter_bytes(64 * 1024):
+                        body.extend(chunk)
+                        if len(body) > self.max_page_bytes:
+                            return self._oversized_result(url, len(body))
+                    elapsed = time.monotonic() - started
+            except httpx.HTTPError as e:
+                logger.error(f"Error crawling {url}: {str(e)}")
+                self.stats['request_errors'] += 1
+                self.scheduler.record_error(host)
+                return url, None, True
             except Exception as e:
                 logger.error(f"Unexpected error: {str(e)}")
-        
+                return url, None, False
+
+        return url, self._finish_download(url, response.headers, body, elapsed, cached), False
+
+    def _classify_response(self, url, status_code, headers, cached):
+        """Decide from the status line and headers alone what to do with a response.
+
+        Returns 'retry', 'not_modified', 'skip' or 'read'.
+        """
+        # Back off and retry when the server asks us to slow down
+        if status_code in (429, 503):
+            self.stats['throttled'] += 1
+            return 'retry'
+
+        if status_code == 304 and cached:
+            return 'not_modified'
+
+        # Skip failed requests and non-HTML responses without downloading the body
+        if not 200 <= status_code < 300:
+            logger.warning(f"Got status code {status_code} for {url}")
+            self.stats['http_errors'] += 1
+            return 'skip'
+
+        if 'text/html' not in headers.get('Content-Type', ''):
+            logger.warning(f"Not an HTML page, skipping download: {url}")
+            self.stats['aborted_non_html'] += 1
+            return 'skip'
+
+        content_length = headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > self.max_page_bytes:
+            logger.warning(f"Page too large ({content_length} bytes), skipping download: {url}")
+            self.stats['aborted_oversized'] += 1
+            return 'skip'
+
+        return 'read'
+
+    def _unread_result(self, url, action, cached, elapsed):
+        """Build the fetch result for a response whose body was not downloaded."""
+        if action == 'not_modified':
+            self.stats['not_modified'] += 1
+            return url, self._reuse_cached(url, cached, elapsed), False
+        return url, None, action == 'retry'
+
+    def _oversized_result(self, url, downloaded):
+        """Abandon a download that went over max_page_bytes."""
+        logger.warning(f"Page exceeded {self.max_page_bytes} bytes, aborting download: {url}")
+        self.stats['aborted_oversized'] += 1
+        self.stats['bytes_downloaded'] += downloaded
+        return url, None, False
+
+    def _finish_download(self, url, headers, body, elapsed, cached):
+        """Decode a fully downloaded HTML body and store it in the HTTP cache."""
+        self.stats['pages_downloaded'] += 1
+        self.stats['bytes_downloaded'] += len(body)
+
+        match = re.search(r'charset=["\']?([\w.:-]+)', headers.get('Content-Type', ''), re.IGNORECASE)
+        try:
+            html_content = bytes(body).decode(match.group(1) if match else 'utf-8', errors='replace')
+        except LookupError:
+            html_content = bytes(body).decode('utf-8', errors='replace')
+
+        if self.cache:
+            self.cache.save(url, headers, html_content, elapsed, replaced=bool(cached))
+        return html_content
+
+    def _store_page(self, url, html_content):
+        """Record a successfully crawled page."""
+        self.pages_data[url] = html_content
+        metadata = self.frontier.metadata(url)
+        if metadata:
+            self.page_metadata[url] = metadata
+        logger.info(f"Successfully crawled page {len(self.pages_data)}: {url}")
+
+    def _reuse_cached(self, url, cached, elapsed):
+        """Return the cached HTML for a URL that answered 304 Not Modified."""
+        logger.info(f"Not modified, using cached copy: {url}")
+        self.cache.record_not_modified(cached, elapsed)
+        return cached[0]
+
+    def _schedule_retry(self, queue, retries, url):
+        """Put a failed URL back at the front of the frontier until it runs out of retries."""
+        retries[url] = retries.get(url, 0) + 1
+        if retries[url] < self.max_retries:
+            logger.info(f"Retrying {url}... Attempt {retries[url]}/{self.max_retries}")
+            queue.requeue(url)
+        else:
+            logger.error(f"Max retries exceeded for {url}")
+
+    def _load_robots(self, url):
+        """Fetch and cache robots.txt for the URL's host (once per host)."""
+        parsed = urlparse(url)
+        if not self.scheduler.needs_robots(parsed.netloc):
+            return
+
+        robots_text = None
+        try:
+            response = self.session.get(f"{parsed.scheme}://{parsed.netloc}/robots.txt", timeout=self.timeout)
+            if response.ok:
+                robots_text = response.text
+        except RequestException as e:
+            logger.warning(f"Could not fetch robots.txt for {parsed.netloc}: {str(e)}")
+        self.scheduler.set_robots(parsed.netloc, robots_text)
+
+    async def _load_robots_async(self, client, url):
+        """Fetch and cache robots.txt for the URL's host (once per host)."""
+        parsed = urlparse(url)
+        if not self.scheduler.needs_robots(parsed.netloc):
+            return
+
+        robots_text = None
+        try:
+            response = await client.get(f"{parsed.scheme}://{parsed.netloc}/robots.txt")
+            if response.is_success:
+                robots_text = response.text
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not fetch robots.txt for {parsed.netloc}: {str(e)}")
+        self.scheduler.set_robots(parsed.netloc, robots_text)
+
+    def _prepare_start_url(self, start_url):
+        """Normalize the start URL and return it together with its domain."""
+        if start_url.endswith('/'):
+            start_url = start_url[:-1]
+
+        # Ensure the URL has a scheme
+        parsed_url = urlparse(start_url)
+        if not parsed_url.scheme:
+            start_url = 'https://' + start_url
+            parsed_url = urlparse(start_url)
+
+        return start_url, parsed_url.netloc
+
+    def _new_frontier(self, start_url):
+        """Create the frontier for a crawl, seeded with the start URL."""
+        self.frontier = CrawlFrontier(bloom_capacity=self.bloom_capacity)
+        if self.scheduler.can_fetch(start_url):
+            self.frontier.add(start_url, front=True)
+        else:
+            logger.warning(f"robots.txt disallows crawling {start_url}")
+        return self.frontier
+
+    def _seed_from_sitemaps(self, queue, start_url, base_domain):
+        """Queue the highest-priority sitemap URLs ahead of link discovery."""
+        parsed = urlparse(start_url)
+        sitemap_urls = list(self.scheduler.sitemaps(parsed.netloc))
+        default_sitemap = f"{parsed.scheme}://{parsed.netloc}/sitemap.xml"
+        if default_sitemap not in sitemap_urls:
+            sitemap_urls.append(default_sitemap)
+
+        reader = SitemapReader(self._open_sitemap)
+        limit = self.sitemap_seed_limit or self.max_pages * 2
+        entries = reader.top_entries(
+            sitemap_urls, limit,
+            accept=lambda loc: self._is_crawlable(normalize_url(loc), base_domain),
+            max_scanned=limit * SITEMAP_SCAN_FACTOR
+        )
+
+        seeded = sum(1 for entry in entries
+                     if queue.add(normalize_url(entry.loc), entry.priority, entry.lastmod))
+        if reader.sitemaps_read:
+            logger.info(f"Read {reader.sitemaps_read} sitemaps listing {reader.urls_seen} URLs; "
+                        f"seeded {seeded} into the frontier")
+
+    def _open_sitemap(self, url):
+        """Open a streaming response body for a sitemap URL, or return None."""
+        time.sleep(self.scheduler.reserve(urlparse(url).netloc))
+        try:
+            response = self.session.get(url, timeout=self.timeout, stream=True)
+        except RequestException as e:
+            logger.warning(f"Could not fetch sitemap {url}: {str(e)}")
+            return None
+        if not response.ok:
+            response.close()
+            return None
+        response.raw.decode_content = True  # Undo Content-Encoding: gzip; .xml.gz files are handled by the reader
+        return response.raw
+
+    def _is_crawlable(self, url, base_domain):
+        """Check that a normalized URL is on the crawl domain, not excluded and allowed by robots.txt."""
+        return (urlparse(url).netloc == base_domain
+                and not self._should_exclude(url)
+                and self.scheduler.can_fetch(url))
+
+    def _extract_links(self, html_content, current_url, base_domain):
+        """Return the normalized same-domain links on a page that are worth crawling."""
+        links = self.parser.links(html_content)
+        logger.info(f"Found {len(links)} links on {current_url}")
+
+        found = []
+        for href in links:
+            full_url = normalize_url(urljoin(current_url, href))
+
+            # Only follow same-domain links, skipping non-content URLs and robots.txt disallowed paths
+            if self._is_crawlable(full_url, base_domain):
+                found.append(full_url)
+        return found
+
+    def _log_crawl_summary(self):
+        """Log the outcome of a crawl."""
         if not self.pages_data:
             logger.warning("Could not crawl any pages. Try a different website or check your connection.")
         else:
             logger.info(f"Crawl complete. Collected {len(self.pages_data)} pages.")
-        
-        return self.pages_data
-    
+        logger.info(f"Crawl stats: {dict(self.stats)}")
+        if self.cache:
+            logger.info(f"HTTP cache stats: {self.cache.stats()}")
+
     def _should_exclude(self, url):
         """Check if URL should be excluded from crawling."""
         # Exclude common file types, admin areas, etc.
@@ -137,7 +533,7 @@ class SEOCrawler:
             '/login', '/logout', '/admin', '/feed/', '/rss/',
             '#', 'javascript:', 'mailto:', 'tel:', 'share=', 'popup'
         ]
-        
+
         lower_url = url.lower()
         return any(pattern in lower_url for pattern in exclude_patterns)
 
@@ -145,19 +541,19 @@ class SEOCrawler:
 if __name__ == "__main__":
     # Test the crawler
     crawler = SEOCrawler()
-    
+
     # Suggest more crawler-friendly sites
     print("Recommended test sites: blog.python.org, example.com, httpbin.org")
     url_to_crawl = input("Enter the website URL to crawl: ")
-    
-    results = crawler.crawl(url_to_crawl)
+
+    results = crawler.crawl_concurrent(url_to_crawl)
     print(f"Successfully crawled {len(results)} pages.")
-    
+
     # Print the first few URLs crawled
     if results:
         print("\nCrawled URLs:")
         for i, url in enumerate(list(results.keys())[:5]):
             print(f"{i+1}. {url}")
-        
+
         if len(results) > 5:
-            print(f"...and {len(results) - 5} more")
\ No newline at end of file
+            print(f"...and {len(results) - 5} more")
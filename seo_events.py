@@ -0,0 +1,118 @@
+# seo_events.py
+
+import json
+import heapq
+import threading
+import time
+import logging
+from collections import deque
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class _Channel:
+    def __init__(self, history, transient_history):
+        self.condition = threading.Condition()
+        self.events = deque(maxlen=history)  # (id, event, data)
+        self.transient = deque(maxlen=transient_history)  # Same, for high-volume live-only events
+        self.next_id = 1
+        self.closed_at = None
+
+    def after(self, last_id):
+        """Return the buffered events with ids above last_id, in id order."""
+        return list(heapq.merge([item for item in self.events if item[0] > last_id],
+                                [item for item in self.transient if item[0] > last_id]))
+
+
+class EventBus:
+    def __init__(self, history=1000, retention=600, transient=('token',), transient_history=100):
+        """Initialize a thread-safe publish/subscribe hub with one channel per analysis.
+
+        Each channel keeps its last `history` events, so a subscriber that connects
+        late (or reconnects with Last-Event-ID) is replayed what it missed. Events
+        named in `transient` (LLM tokens) are kept in a separate buffer of
+        `transient_history`, so a flood of them can't push page and status events
+        out of the replay history. Closed channels are dropped `retention` seconds
+        after they close.
+        """
+        self.history = history
+        self.retention = retention
+        self.transient = frozenset(transient)
+        self.transient_history = transient_history
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def open(self, channel):
+        """Create a channel, dropping expired closed ones."""
+        with self._lock:
+            now = time.time()
+            for name, existing in list(self._channels.items()):
+                if existing.closed_at is not None and now - existing.closed_at > self.retention:
+                    del self._channels[name]
+            self._channels[channel] = _Channel(self.history, self.transient_history)
+
+    def exists(self, channel):
+        """Check whether a channel is open or recently closed."""
+        with self._lock:
+            return channel in self._channels
+
+    def _get(self, channel):
+        with self._lock:
+            return self._channels.get(channel)
+
+    def publish(self, channel, event, data):
+        """Append an event to an open channel and wake its subscribers."""
+        target = self._get(channel)
+        if target is None:
+            return
+        with target.condition:
+            if target.closed_at is not None:
+                return
+            buffer = target.transient if event in self.transient else target.events
+            buffer.append((target.next_id, event, data))
+            target.next_id += 1
+            target.condition.notify_all()
+
+    def close(self, channel):
+        """Mark a channel finished; subscribers end after draining it."""
+        target = self._get(channel)
+        if target is None:
+            return
+        with target.condition:
+            if target.closed_at is None:
+                target.closed_at = time.time()
+                target.condition.notify_all()
+
+    def subscribe(self, channel, last_id=0, keepalive=15):
+        """Yield (id, event, data) for events after `last_id` until the channel closes.
+
+        Yields None after `keepalive` seconds without events so the caller can keep
+        an idle connection open. A subscriber that falls far behind may miss
+        transient events, never the others (within `history`).
+        """
+        target = self._get(channel)
+        if target is None:
+            return
+        while True:
+            with target.condition:
+                target.condition.wait_for(
+                    lambda: target.closed_at is not None or target.next_id - 1 > last_id, keepalive)
+                pending = target.after(last_id)
+                closed = target.closed_at is not None
+            if pending:
+                yield from pending
+                last_id = pending[-1][0]
+            elif closed:
+                return
+            else:
+                yield None
+
+    def stream(self, channel, last_id=0, keepalive=15):
+        """Format a channel's events as a text/event-stream body."""
+        for item in self.subscribe(channel, last_id, keepalive):
+            if item is None:
+                yield ": keepalive\n\n"
+                continue
+            event_id, event, data = item
+            yield f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
@@ -1,41 +1,114 @@
 # seo_extractor.py
 
-from bs4 import BeautifulSoup
-import re
+from bs4.element import Tag, NavigableString, CData
+from seo_parsers import get_parser_backend
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+import multiprocessing
+import threading
+import os
 import json
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class SEOExtractor:
+# Elements whose text does not count towards the main-content word count
+NON_CONTENT_TAGS = frozenset(['script', 'style', 'nav', 'footer', 'header'])
+
+# String types get_text() treats as visible text (no comments, scripts, templates...)
+TEXT_STRING_TYPES = (NavigableString, CData)
+
+
+class PageCollector:
+    """Everything extract_seo_data needs, gathered in a single walk over the tree."""
+
     def __init__(self):
-        """Initialize the SEO data extractor."""
-        pass
+        self.title_tag = None
+        self.meta_title_tag = None
+        self.meta_description_tag = None
+        self.h1_texts = []  # One list of text fragments per <h1>
+        self.content_text = []  # Visible text outside NON_CONTENT_TAGS
+        self.json_ld_scripts = []
+        self.microdata_types = []
+        self.rdfa_types = []
+
+    def collect(self, soup):
+        """Walk the tree once, in document order, without modifying it."""
+        # Stack entries: (node, inside a non-content element, text lists of the open <h1>s)
+        stack = [(soup, False, ())]
+        while stack:
+            node, non_content, open_h1s = stack.pop()
+
+            if isinstance(node, NavigableString):
+                if type(node) in TEXT_STRING_TYPES:
+                    if not non_content:
+                        self.content_text.append(node)
+                    for h1_text in open_h1s:
+                        h1_text.append(node)
+                continue
+
+            if not isinstance(node, Tag):
+                continue
+
+            name = node.name
+            if name == 'title':
+                if self.title_tag is None:
+                    self.title_tag = node
+            elif name == 'meta':
+                meta_name = node.get('name')
+                if meta_name == 'title' and self.meta_title_tag is None:
+                    self.meta_title_tag = node
+                elif meta_name == 'description' and self.meta_description_tag is None:
+                    self.meta_description_tag = node
+            elif name == 'h1':
+                h1_text = []
+                self.h1_texts.append(h1_text)
+                open_h1s = open_h1s + (h1_text,)
+            elif name == 'script' and node.get('type') == 'application/ld+json':
+                self.json_ld_scripts.append(node)
+
+            if node.get('itemscope') is not None and node.get('itemtype'):
+                self.microdata_types.append(node['itemtype'])
+            if node.get('typeof'):
+                self.rdfa_types.append(node['typeof'])
+
+            child_non_content = non_content or name in NON_CONTENT_TAGS
+            for child in reversed(node.contents):
+                stack.append((child, child_non_content, open_h1s))
+        return self
+
+
+class SEOExtractor:
+    def __init__(self, parser=None):
+        """Initialize the SEO data extractor with an HTML parser backend (see seo_parsers)."""
+        self.parser = get_parser_backend(parser)
         
     def extract_seo_data(self, url, html_content):
         """Extract SEO data from HTML content."""
         logger.info(f"Extracting SEO data from: {url}")
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self.parser.parse(html_content)
+        page = PageCollector().collect(soup)
         
         # Extract data
         data = {
             'url': url,
-            'meta_title': self._extract_meta_title(soup),
-            'meta_description': self._extract_meta_description(soup),
-            'h1_tags': self._extract_h1_tags(soup),
-            'word_count': self._calculate_word_count(soup),
-            'structured_data': self._extract_structured_data(soup)
+            'meta_title': self._extract_meta_title(page),
+            'meta_description': self._extract_meta_description(page),
+            'h1_tags': self._extract_h1_tags(page),
+            'word_count': self._calculate_word_count(page),
+            'structured_data': self._extract_structured_data(page)
         }
         
         logger.info(f"Extraction complete for: {url}")
         return data
     
-    def _extract_meta_title(self, soup):
+    def _extract_meta_title(self, page):
         """Extract meta title from the page."""
         # Try title tag first
-        title_tag = soup.title
+        title_tag = page.title_tag
         title = title_tag.string if title_tag and title_tag.string else None
         
         # Clean up the title
@@ -44,24 +117,23 @@ class SEOExtractor:
         
         # If no title tag, try meta title
         if not title:
-            meta_title = soup.find('meta', attrs={'name': 'title'})
+            meta_title = page.meta_title_tag
             if meta_title and meta_title.get('content'):
                 title = meta_title['content'].strip()
                 
         return title or "No title found"
 
-    def _extract_meta_description(self, soup):
+    def _extract_meta_description(self, page):
         """Extract meta description from the page."""
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        meta_desc = page.meta_description_tag
         if meta_desc and meta_desc.get('content') and meta_desc['content']:
             description = meta_desc['content'].strip()
             return description if description else "No meta description found"
         return "No meta description found"
     
-    def _extract_h1_tags(self, soup):
+    def _extract_h1_tags(self, page):
         """Extract H1 tags from the page."""
-        h1_elements = soup.find_all('h1')
-        h1_contents = [h1.get_text().strip() for h1 in h1_elements]
+        h1_contents = [''.join(h1_text).strip() for h1_text in page.h1_texts]
         
         # Also check for the count - multiple H1s are an SEO issue
         h1_count = len(h1_contents)
@@ -71,26 +143,18 @@ class SEOExtractor:
             'contents': h1_contents if h1_contents else ["No H1 tag found"]
         }
     
-    def _calculate_word_count(self, soup):
+    def _calculate_word_count(self, page):
         """Calculate approximate word count of the main content."""
-        # Remove scripts, styles, and other non-content elements
-        for element in soup(['script', 'style', 'nav', 'footer', 'header']):
-            element.extract()
-        
-        # Get the text and normalize spaces
-        text = soup.get_text()
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Count words
-        words = text.split()
-        return len(words)
+        # Scripts, styles, nav, header and footer text was already left out by the
+        # collector, so the tree is never modified
+        return len(''.join(page.content_text).split())
     
-    def _extract_structured_data(self, soup):
+    def _extract_structured_data(self, page):
         """Extract structured data from the page."""
         structured_data = {
-            'json_ld': self._extract_json_ld(soup),
-            'microdata': self._check_microdata(soup),
-            'rdfa': self._check_rdfa(soup)
+            'json_ld': self._extract_json_ld(page),
+            'microdata': page.microdata_types,
+            'rdfa': page.rdfa_types
         }
         
         # Also provide a summary of what was found
@@ -106,12 +170,11 @@ class SEOExtractor:
         
         return structured_data
     
-    def _extract_json_ld(self, soup):
+    def _extract_json_ld(self, page):
         """Extract JSON-LD structured data."""
-        json_ld_scripts = soup.find_all('script', type='application/ld+json')
         result = []
         
-        for script in json_ld_scripts:
+        for script in page.json_ld_scripts:
             try:
                 data = json.loads(script.string)
                 # Just extract the @type for summary purposes
@@ -121,34 +184,148 @@ class SEOExtractor:
                     for item in data:
                         if isinstance(item, dict) and '@type' in item:
                             result.append(item['@type'])
-            except (json.JSONDecodeError, AttributeError):
+            except (json.JSONDecodeError, TypeError, AttributeError):
                 pass
                 
         return result
-    
-    def _check_microdata(self, soup):
-        """Check for presence of Microdata."""
-        # Look for itemscope, itemtype attributes
-        elements_with_itemscope = soup.find_all(attrs={'itemscope': True})
-        
-        microdata_types = []
-        for element in elements_with_itemscope:
-            if element.get('itemtype'):
-                microdata_types.append(element['itemtype'])
-                
-        return microdata_types
-    
-    def _check_rdfa(self, soup):
-        """Check for presence of RDFa."""
-        # Look for typeof, property attributes
-        elements_with_typeof = soup.find_all(attrs={'typeof': True})
-        
-        rdfa_types = []
-        for element in elements_with_typeof:
-            if element.get('typeof'):
-                rdfa_types.append(element['typeof'])
-                
-        return rdfa_types
+
+
+# Extractor used inside each pool worker, created once per process by _init_worker
+_worker_extractor = None
+
+
+def _init_worker(parser):
+    """Pool initializer: build the worker's extractor (and parser backend) once."""
+    global _worker_extractor
+    _worker_extractor = SEOExtractor(parser=parser)
+
+
+def _extract_chunk(chunk):
+    """Extract a list of (url, html) pairs inside a pool worker."""
+    return [_worker_extractor.extract_seo_data(url, html_content) for url, html_content in chunk]
+
+
+def _extract_page(url, html_content):
+    """Extract a single page inside a pool worker."""
+    return _worker_extractor.extract_seo_data(url, html_content)
+
+
+def _pool_context():
+    """Start workers from a clean server process rather than forking a threaded parent (Flask)."""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['seo_extractor'])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+class ParallelExtractor:
+    def __init__(self, workers=None, chunksize=None, parser=None, inline_pages=None):
+        """Initialize an extraction stage that spreads pages over a process pool.
+
+        `workers` defaults to SEOLYZER_EXTRACT_WORKERS or the number of CPUs; with a
+        single worker pages are extracted in-process. `chunksize` (default
+        SEOLYZER_EXTRACT_CHUNKSIZE or 8) is the number of pages sent to a worker per
+        task: larger chunks cut inter-process overhead, smaller ones smooth progress.
+        Crawls of up to `inline_pages` pages (default SEOLYZER_EXTRACT_INLINE_PAGES or
+        50) are extracted in-process by both submit() and iter_extract(), since pool
+        start-up costs more than it saves on them; pass 0 to always use the pool,
+        e.g. to keep parsing off a web server's request threads.
+        """
+        if workers is None:
+            workers = int(os.getenv("SEOLYZER_EXTRACT_WORKERS", "0")) or os.cpu_count() or 1
+        if chunksize is None:
+            chunksize = int(os.getenv("SEOLYZER_EXTRACT_CHUNKSIZE", "8"))
+        if inline_pages is None:
+            inline_pages = int(os.getenv("SEOLYZER_EXTRACT_INLINE_PAGES", "50"))
+        self.workers = max(1, workers)
+        self.chunksize = max(1, chunksize)
+        self.inline_pages = max(0, inline_pages)
+        self.parser = parser
+        self.extractor = SEOExtractor(parser=parser)  # In-process fallback; also validates the parser
+        self._pool = None  # Long-lived pool behind submit(), shut down by close()
+        self._pool_lock = threading.Lock()
+        self._submitted = 0  # Pages passed to submit() since the last close()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context(),
+                                   initializer=_init_worker, initargs=(self.parser,))
+
+    def submit(self, url, html_content):
+        """Queue one page for extraction and return a Future for its seo_data.
+
+        Used by streaming callers that receive pages one at a time. The pool is kept
+        until close(); with a single worker, or until more than `inline_pages` pages
+        have been submitted, the page is extracted immediately.
+        """
+        with self._pool_lock:
+            self._submitted += 1
+            inline = self.workers == 1 or self._submitted <= self.inline_pages
+            if not inline and self._pool is None:
+                self._pool = self._new_pool()
+        if inline:
+            future = Future()
+            try:
+                future.set_result(self.extractor.extract_seo_data(url, html_content))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._pool.submit(_extract_page, url, html_content)
+
+    def close(self):
+        """Shut down the pool started by submit(), if any."""
+        with self._pool_lock:
+            self._submitted = 0
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def iter_extract(self, pages):
+        """Yield (url, seo_data) for a URL -> HTML mapping, in the mapping's order.
+
+        At most two chunks per worker are in flight, so pages are read from the
+        (possibly on-disk) page store as the pool drains rather than all at once.
+        """
+        items = iter(pages.items())
+        if self.workers == 1 or len(pages) <= self.inline_pages:
+            for url, html_content in items:
+                yield url, self.extractor.extract_seo_data(url, html_content)
+            return
+
+        pool = self._new_pool()
+        in_flight = deque()
+        try:
+            while True:
+                while len(in_flight) < self.workers * 2:
+                    chunk = list(islice(items, self.chunksize))
+                    if not chunk:
+                        break
+                    in_flight.append(([url for url, _ in chunk], pool.submit(_extract_chunk, chunk)))
+                if not in_flight:
+                    break
+                urls, future = in_flight.popleft()
+                yield from zip(urls, future.result())
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def extract_all(self, pages, progress_callback=None):
+        """Extract every page into a URL -> seo_data dict.
+
+        `progress_callback(done, total, url)` is called in this process after each page.
+        """
+        total = len(pages)
+        results = {}
+        for done, (url, seo_data) in enumerate(self.iter_extract(pages), 1):
+            results[url] = seo_data
+            if progress_callback:
+                progress_callback(done, total, url)
+        return results
 
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+# seo_frontier.py
+
+import hashlib
+import heapq
+import itertools
+import math
+import logging
+from collections import deque
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def normalize_url(url):
+    """Return the canonical form used to key crawled URLs."""
+    url = url.rstrip('/')  # Remove trailing slash
+    url = url.split('#')[0]  # Remove fragments
+    url = url.split('?')[0]  # Remove query parameters
+    return url.lower()  # Case normalization (if server is case-insensitive)
+
+
+class BloomFilter:
+    def __init__(self, capacity=100000, error_rate=0.001):
+        """Initialize a fixed-size Bloom filter for roughly `capacity` items."""
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        # Standard sizing: m = -n ln(p) / ln(2)^2 bits, k = (m / n) ln(2) hashes
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        """Yield the bit positions for an item using double hashing."""
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item):
+        """Add an item to the filter."""
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def __len__(self):
+        return self.count
+
+
+class CrawlFrontier:
+    def __init__(self, bloom_capacity=None, error_rate=0.001):
+        """Initialize a crawl frontier that deduplicates URLs when they are enqueued.
+
+        Discovered links are crawled FIFO (BFS). URLs added with a priority, such as
+        sitemap entries, go into a heap and are crawled first, highest priority and
+        most recent lastmod first. The start URL and retries jump ahead of both.
+
+        By default seen URLs are tracked in an exact set. Passing `bloom_capacity`
+        switches to a Bloom filter, which keeps memory flat for very large crawls at
+        the cost of occasionally skipping a URL that was never actually queued.
+        """
+        self._front = deque()
+        self._queue = deque()
+        self._heap = []
+        self._counter = itertools.count()
+        self._metadata = {}
+        if bloom_capacity:
+            self._seen = BloomFilter(bloom_capacity, error_rate)
+        else:
+            self._seen = set()
+
+    def add(self, url, priority=None, lastmod=None, front=False):
+        """Queue a URL unless its canonical form has been seen. Returns True if queued."""
+        key = normalize_url(url)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        if front:
+            self._front.append(url)
+        elif priority is None:
+            self._queue.append(url)
+        else:
+            # heapq is a min-heap, so negate priority; ISO lastmod strings sort chronologically
+            heapq.heappush(self._heap, (-priority, _newest_first(lastmod), next(self._counter), url))
+            self._metadata[url] = {'priority': priority, 'lastmod': lastmod}
+        return True
+
+    def extend(self, urls):
+        """Queue several URLs, returning how many were new."""
+        return sum(1 for url in urls if self.add(url))
+
+    def requeue(self, url):
+        """Put a previously queued URL back at the front (e.g. for a retry)."""
+        self._front.appendleft(url)
+
+    def pop(self):
+        """Remove and return the next URL to crawl."""
+        if self._front:
+            return self._front.popleft()
+        if self._heap:
+            return heapq.heappop(self._heap)[-1]
+        return self._queue.popleft()
+
+    def metadata(self, url):
+        """Return the sitemap metadata (priority, lastmod) a URL was queued with, if any."""
+        return self._metadata.get(url)
+
+    def seen(self, url):
+        """Check whether a URL's canonical form has already been queued."""
+        return normalize_url(url) in self._seen
+
+    def __len__(self):
+        return len(self._front) + len(self._queue) + len(self._heap)
+
+    def __bool__(self):
+        return bool(self._front) or bool(self._queue) or bool(self._heap)
+
+
+def _newest_first(lastmod):
+    """Sort key that orders lastmod strings newest first (missing dates last)."""
+    if not lastmod:
+        return (1,)
+    return tuple(-ord(ch) for ch in lastmod)
@@ -0,0 +1,113 @@
+# seo_jobs.py
+
+import os
+import math
+import threading
+import time
+import logging
+from collections import deque
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_SECONDS = 60  # Retry-After estimate before any job has finished
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit when every worker is busy and the queue is full."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Too many analyses in progress, retry in {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class JobQueue:
+    def __init__(self, handler, workers=None, max_queued=None):
+        """Initialize a fixed pool of worker threads fed from a bounded FIFO queue.
+
+        Each job runs handler(job_id, *args) on one of `workers` threads (default
+        SEOLYZER_WORKERS or 2). Jobs go straight to idle workers; at most
+        `max_queued` more (default SEOLYZER_MAX_QUEUED or 20) wait for one, and
+        further submissions are rejected with QueueFull instead of piling up
+        crawls and LLM calls.
+        """
+        if workers is None:
+            workers = int(os.getenv("SEOLYZER_WORKERS", "2"))
+        if max_queued is None:
+            max_queued = int(os.getenv("SEOLYZER_MAX_QUEUED", "20"))
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_queued = max(0, max_queued)
+        self._pending = deque()  # (job_id, args)
+        self._running = set()
+        self._durations = deque(maxlen=20)  # Seconds taken by recent jobs
+        self._condition = threading.Condition()
+        self._threads = []
+        self.completed = 0
+        self.rejected = 0
+
+    def _start(self):
+        """Start the worker threads on first use."""
+        if not self._threads:
+            self._threads = [threading.Thread(target=self._work, name=f"seo-job-{i}", daemon=True)
+                             for i in range(self.workers)]
+            for thread in self._threads:
+                thread.start()
+
+    def submit(self, job_id, *args):
+        """Queue a job and return its queue position (1 = next to start), or raise QueueFull."""
+        with self._condition:
+            idle = self.workers - len(self._running)
+            if len(self._pending) >= idle + self.max_queued:
+                self.rejected += 1
+                raise QueueFull(self._retry_after())
+            self._start()
+            self._pending.append((job_id, args))
+            self._condition.notify()
+            return len(self._pending)
+
+    def job_ids(self):
+        """Return the ids of the running and waiting jobs."""
+        with self._condition:
+            return list(self._running) + [job_id for job_id, _ in self._pending]
+
+    def positions(self):
+        """Return {job_id: queue position} for every waiting job."""
+        with self._condition:
+            return {job_id: position for position, (job_id, _) in enumerate(self._pending, 1)}
+
+    def _retry_after(self):
+        """Estimate the seconds until a queue slot frees up: one job's time spread over the workers."""
+        average = sum(self._durations) / len(self._durations) if self._durations else DEFAULT_JOB_SECONDS
+        return max(1, math.ceil(average / self.workers))
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                job_id, args = self._pending.popleft()
+                self._running.add(job_id)
+
+            started = time.time()
+            try:
+                self.handler(job_id, *args)
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {str(e)}")
+            finally:
+                with self._condition:
+                    self._running.discard(job_id)
+                    self._durations.append(time.time() - started)
+                    self.completed += 1
+
+    def stats(self):
+        """Return the queue's current load and totals."""
+        with self._condition:
+            return {
+                'workers': self.workers,
+                'running': len(self._running),
+                'queued': len(self._pending),
+                'max_queued': self.max_queued,
+                'completed': self.completed,
+                'rejected': self.rejected,
+            }
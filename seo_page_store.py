@@ -0,0 +1,148 @@
+# seo_page_store.py
+
+import os
+import gzip
+import tempfile
+import threading
+import logging
+from collections.abc import MutableMapping
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+RECORD_MAGIC = b"SEOLYZER-PAGE"
+
+
+class MemoryPageStore(dict):
+    """Default page store: crawled HTML kept in a plain dict."""
+
+    def close(self):
+        """Release the stored pages."""
+        self.clear()
+
+
+class NullPageStore(dict):
+    """Page store for callers that consume pages through on_page: keeps the URLs, drops the HTML."""
+
+    def __setitem__(self, url, html_content):
+        super().__setitem__(url, None)
+
+    def close(self):
+        """Forget the stored URLs."""
+        self.clear()
+
+
+class DiskPageStore(MutableMapping):
+    def __init__(self, path=None, compression='gzip', level=None):
+        """Initialize an append-only, WARC-like page file with an in-memory offset index.
+
+        Each record is a header line `SEOLYZER-PAGE <length> <url>` followed by the
+        compressed HTML bytes. Only the index (URL -> offset, length) stays in memory;
+        pages are decompressed lazily when read. Without a `path` a temporary file is
+        used and removed on close(). An existing file is reopened and re-indexed.
+        """
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+        if compression not in ('gzip', 'zstd', None):
+            raise ValueError(f"Unsupported page store compression: {compression}")
+
+        self.compression = compression
+        self.level = level
+        self._temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="seolyzer_pages_", suffix=".pages")
+            os.close(fd)
+        self.path = path
+        self._index = {}
+        self._lock = threading.Lock()
+        self._file = open(path, 'a+b')
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the offset index by scanning the record headers of an existing file."""
+        self._file.seek(0)
+        while True:
+            header = self._file.readline()
+            if not header:
+                break
+            magic, length, url = header.rstrip(b"\n").split(b" ", 2)
+            if magic != RECORD_MAGIC:
+                raise ValueError(f"Corrupt page store: {self.path}")
+            offset = self._file.tell()
+            self._index[url.decode('utf-8')] = (offset, int(length))
+            self._file.seek(offset + int(length))
+
+    def _compress(self, data):
+        if self.compression == 'gzip':
+            return gzip.compress(data, compresslevel=self.level or 6)
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor(level=self.level or 3).compress(data)
+        return data
+
+    def _decompress(self, data):
+        if self.compression == 'gzip':
+            return gzip.decompress(data)
+        if self.compression == 'zstd':
+            return zstandard.ZstdDecompressor().decompress(data)
+        return data
+
+    def __setitem__(self, url, html_content):
+        if isinstance(html_content, str):
+            html_content = html_content.encode('utf-8')
+        data = self._compress(html_content)
+        header = RECORD_MAGIC + b" " + str(len(data)).encode() + b" " + url.encode('utf-8') + b"\n"
+
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell() + len(header)
+            self._file.write(header)
+            self._file.write(data)
+            self._file.flush()
+            self._index[url] = (offset, len(data))
+
+    def __getitem__(self, url):
+        offset, length = self._index[url]
+        with self._lock:
+            self._file.seek(offset)
+            data = self._file.read(length)
+        return self._decompress(data).decode('utf-8')
+
+    def __delitem__(self, url):
+        # Append-only: the record stays in the file but is no longer indexed
+        del self._index[url]
+
+    def __iter__(self):
+        return iter(list(self._index))
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, url):
+        return url in self._index
+
+    def size_on_disk(self):
+        """Return the size of the page file in bytes."""
+        return os.path.getsize(self.path)
+
+    def close(self):
+        """Close the page file, deleting it if it was a temporary file."""
+        if self._file.closed:
+            return
+        self._file.close()
+        self._index.clear()
+        if self._temporary:
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                logger.warning(f"Could not remove page store {self.path}: {str(e)}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
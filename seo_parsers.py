@@ -0,0 +1,97 @@
+# seo_parsers.py
+
+import os
+import logging
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    import lxml.etree
+except ImportError:  # lxml is optional; html.parser is always available
+    lxml = None
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARSER = 'html.parser'
+
+
+class LinkScanner(HTMLParser):
+    """Collect <a href> values without building a document tree.
+
+    Link discovery only needs anchors, so the crawler uses this instead of a full
+    BeautifulSoup parse; the page is parsed into a tree once, by SEOExtractor.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            href = dict(attrs).get('href', False)
+            if href is not False:
+                self.links.append(href or '')
+
+
+def scan_links(html_content):
+    """Return the raw href values of all anchors in an HTML document."""
+    scanner = LinkScanner()
+    scanner.feed(html_content)
+    scanner.close()
+    return scanner.links
+
+
+class HTMLParserBackend:
+    """Python's built-in html.parser (pure Python, always available)."""
+
+    name = 'html.parser'
+
+    def parse(self, html_content):
+        """Parse a document into a BeautifulSoup tree."""
+        return BeautifulSoup(html_content, 'html.parser')
+
+    def links(self, html_content):
+        """Return the raw href values of all anchors."""
+        return scan_links(html_content)
+
+
+class LxmlBackend:
+    """libxml2-based parsing through lxml (C-accelerated, several times faster)."""
+
+    name = 'lxml'
+
+    def __init__(self):
+        if lxml is None:
+            raise ValueError("The 'lxml' parser backend requires the lxml package (pip install lxml)")
+        # Feed bytes with an explicit encoding so documents with an XML encoding
+        # declaration are accepted
+        self._link_parser = lxml.html.HTMLParser(encoding='utf-8')
+
+    def parse(self, html_content):
+        """Parse a document into a BeautifulSoup tree."""
+        return BeautifulSoup(html_content, 'lxml')
+
+    def links(self, html_content):
+        """Return the raw href values of all anchors."""
+        try:
+            document = lxml.html.document_fromstring(html_content.encode('utf-8'), parser=self._link_parser)
+        except (lxml.etree.ParserError, ValueError):
+            return []  # Empty or unparseable document
+        return [anchor.get('href') for anchor in document.iter('a') if anchor.get('href') is not None]
+
+
+PARSER_BACKENDS = {
+    HTMLParserBackend.name: HTMLParserBackend,
+    LxmlBackend.name: LxmlBackend,
+}
+
+
+def get_parser_backend(name=None):
+    """Return a parser backend by name, defaulting to SEOLYZER_HTML_PARSER or html.parser."""
+    if name is None:
+        name = os.getenv("SEOLYZER_HTML_PARSER", DEFAULT_PARSER)
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend '{name}'. Choose from: {', '.join(PARSER_BACKENDS)}")
+    return PARSER_BACKENDS[name]()
@@ -0,0 +1,180 @@
+# seo_pipeline.py
+
+import os
+import queue
+import threading
+import time
+import logging
+from collections import Counter
+from seo_crawler import SEOCrawler
+from seo_page_store import NullPageStore
+from seo_extractor import ParallelExtractor
+from seo_recommendation import SEORecommendationGenerator
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+_DONE = object()  # End-of-stream marker passed down the queues
+
+
+class SEOPipeline:
+    def __init__(self, crawler=None, extractor=None, recommendation_generator=None,
+                 queue_size=None, recommend_workers=None):
+        """Initialize a crawl -> extract -> recommend pipeline whose stages run concurrently.
+
+        Each page is handed to extraction as soon as it is fetched and to the
+        recommendation stage as soon as it is extracted. The stages are connected by
+        bounded queues of `queue_size` items (default SEOLYZER_PIPELINE_QUEUE_SIZE or
+        16): when a later stage falls behind, the earlier one blocks instead of
+        piling up pages in memory. `recommend_workers` threads (default
+        SEOLYZER_RECOMMEND_WORKERS or 4) call the recommendation generator.
+        """
+        if queue_size is None:
+            queue_size = int(os.getenv("SEOLYZER_PIPELINE_QUEUE_SIZE", "16"))
+        if recommend_workers is None:
+            recommend_workers = int(os.getenv("SEOLYZER_RECOMMEND_WORKERS", "4"))
+        # Pages reach extraction through on_page, so the crawler doesn't need to keep them
+        self.crawler = crawler or SEOCrawler(page_store=NullPageStore())
+        # An extractor passed in may be shared by several pipelines; only close our own
+        self.extractor = extractor or ParallelExtractor()
+        self._owns_extractor = extractor is None
+        self.recommendation_generator = recommendation_generator or SEORecommendationGenerator()
+        self.queue_size = max(1, queue_size)
+        self.recommend_workers = max(1, recommend_workers)
+        self.stats = Counter()  # Pages through each stage: crawled, extracted, recommended, failed
+        self.errors = {}  # url -> why the page dropped out of the last run
+
+    def config(self):
+        """Return the settings that determine an analysis' result, e.g. to key cached results."""
+        return {
+            'max_pages': self.crawler.max_pages,
+            'max_page_bytes': self.crawler.max_page_bytes,
+            'parser': self.crawler.parser.name,
+            'recommendations': self.recommendation_generator.config(),
+        }
+
+    def run(self, url, on_result=None, on_progress=None, on_token=None):
+        """Analyze a website and return {url: {"seo_data", "recommendations"}} in crawl order.
+
+        `on_result(url, result)` is called as soon as a page's recommendations are
+        ready and `on_progress(stage, url)` whenever a page leaves a stage
+        ('crawled', 'extracted' or 'recommended'). With `on_token(url, text)`,
+        recommendations are streamed and passed to it as they are written. All
+        callbacks run on worker threads.
+
+        A failing stage or callback never stalls the pipeline: the page is recorded
+        in `errors`, the remaining pages still drain through every stage, and the
+        first such exception is re-raised once all stages have finished.
+        """
+        logger.info(f"Starting pipelined SEO analysis for: {url}")
+        start_time = time.time()
+        self.stats.clear()
+        self.errors = {}
+
+        pages = queue.Queue(maxsize=self.queue_size)  # crawl -> extract: (url, html)
+        extracted = queue.Queue(maxsize=self.queue_size)  # extract -> recommend: (url, Future)
+        order = []
+        results = {}
+        lock = threading.Lock()
+        stage_errors = []  # Exceptions raised by stages or callbacks, first one re-raised
+
+        def fail(stage, page_url, e):
+            logger.error(f"{stage.capitalize()} stage failed for {page_url}: {str(e)}")
+            with lock:
+                self.stats['failed'] += 1
+                self.errors.setdefault(page_url, f"{stage} failed: {str(e)}")
+                stage_errors.append(e)
+
+        def progress(stage, page_url):
+            with lock:
+                self.stats[stage] += 1
+            if on_progress:
+                on_progress(stage, page_url)
+
+        def page_crawled(page_url, html_content):
+            order.append(page_url)
+            pages.put((page_url, html_content))  # Blocks while extraction is behind
+            try:
+                progress('crawled', page_url)
+            except Exception as e:  # Don't let a failing callback abort the crawl
+                fail('crawl', page_url, e)
+
+        def crawl_stage():
+            try:
+                self.crawler.on_page = page_crawled
+                self.crawler.crawl_concurrent(url)
+            except Exception as e:
+                fail('crawl', url, e)
+            finally:
+                self.crawler.on_page = None
+                pages.put(_DONE)
+
+        def extract_stage():
+            try:
+                while True:
+                    item = pages.get()
+                    if item is _DONE:
+                        break
+                    page_url, html_content = item
+                    try:
+                        future = self.extractor.submit(page_url, html_content)
+                    except Exception as e:  # e.g. BrokenProcessPool; keep draining the crawl
+                        fail('extract', page_url, e)
+                        continue
+                    extracted.put((page_url, future))
+            finally:
+                for _ in range(self.recommend_workers):
+                    extracted.put(_DONE)
+
+        def recommend_stage():
+            while True:
+                item = extracted.get()
+                if item is _DONE:
+                    break
+                page_url, future = item
+                try:
+                    page_data = future.result()
+                except Exception as e:
+                    # A page that can't be parsed is skipped, not an error of the run
+                    logger.error(f"Error extracting SEO data from {page_url}: {str(e)}")
+                    with lock:
+                        self.errors[page_url] = f"extraction failed: {str(e)}"
+                    try:
+                        progress('failed', page_url)
+                    except Exception as e:
+                        fail('recommend', page_url, e)
+                    continue
+                try:
+                    progress('extracted', page_url)
+                    recommendations = self.recommendation_generator.generate_recommendations(page_data, on_token)
+                    result = {
+                        "seo_data": page_data,
+                        "recommendations": recommendations.get("recommendations", "Error generating recommendations")
+                    }
+                    with lock:
+                        results[page_url] = result
+                    progress('recommended', page_url)
+                    if on_result:
+                        on_result(page_url, result)
+                except Exception as e:
+                    fail('recommend', page_url, e)
+
+        threads = [threading.Thread(target=crawl_stage, name="seo-crawl"),
+                   threading.Thread(target=extract_stage, name="seo-extract")]
+        threads += [threading.Thread(target=recommend_stage, name=f"seo-recommend-{i}")
+                    for i in range(self.recommend_workers)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            if self._owns_extractor:
+                self.extractor.close()
+            self.crawler.pages_data.close()
+
+        elapsed_time = time.time() - start_time
+        logger.info(f"Pipelined analysis complete. {dict(self.stats)} in {elapsed_time:.2f} seconds.")
+        if stage_errors:
+            raise stage_errors[0]
+        return {page_url: results[page_url] for page_url in order if page_url in results}
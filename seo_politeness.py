@@ -0,0 +1,180 @@
+# seo_politeness.py
+
+import threading
+import time
+import logging
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+from seo_rate_limit import TokenBucket
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) to seconds, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostPolicy:
+    def __init__(self, delay=1.0, burst=1, adaptive=True, respect_crawl_delay=True,
+                 min_delay=0.25, max_delay=60.0):
+        """Per-host politeness settings.
+
+        `delay` is the starting gap between requests (the token bucket refills at
+        1/delay requests per second, holding up to `burst` tokens). A delay of 0
+        disables throttling. When `adaptive` is set, the delay follows the
+        observed response latency between `min_delay` and `max_delay`.
+        """
+        self.delay = delay
+        self.burst = burst
+        self.adaptive = adaptive
+        self.respect_crawl_delay = respect_crawl_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+
+
+class _HostState:
+    def __init__(self, policy):
+        """Runtime throttling state for one host."""
+        self.policy = policy
+        self.delay = policy.delay
+        self.crawl_delay = 0.0
+        self.blocked_until = 0.0
+        self.bucket = TokenBucket(1.0 / policy.delay if policy.delay else None, policy.burst)
+
+    def apply_delay(self, delay, burst=None):
+        """Update the delay and the matching token bucket rate (and optionally its burst)."""
+        self.delay = delay
+        self.bucket.set_rate(1.0 / delay if delay else None, burst)
+
+
+class PolitenessScheduler:
+    def __init__(self, user_agent='*', default_policy=None, target_concurrency=1.0):
+        """Initialize a per-host scheduler that honours robots.txt and adapts to server load.
+
+        `target_concurrency` is the average number of requests we are willing to
+        have outstanding against a host; the adaptive delay converges on
+        latency / target_concurrency (the same idea as Scrapy's AutoThrottle). The
+        default policy lets that many requests start at once (its burst), so
+        per-host concurrency isn't reduced to one request at a time.
+        """
+        self.user_agent = user_agent
+        self.default_policy = default_policy or HostPolicy(burst=max(1, int(target_concurrency)))
+        self.target_concurrency = target_concurrency
+        self.host_policies = {}
+        self._hosts = {}
+        self._robots = {}
+        self._lock = threading.Lock()
+
+    def set_host_policy(self, host, policy):
+        """Use custom token-bucket settings for a host."""
+        with self._lock:
+            self.host_policies[host] = policy
+            self._hosts.pop(host, None)
+
+    def whitelist(self, host, burst=8):
+        """Crawl a host we own at full speed, ignoring Crawl-delay and latency adaptation."""
+        self.set_host_policy(host, HostPolicy(delay=0, burst=burst, adaptive=False,
+                                              respect_crawl_delay=False))
+
+    def _state(self, host):
+        """Return (creating if needed) the throttling state for a host."""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = _HostState(self.host_policies.get(host, self.default_policy))
+                self._hosts[host] = state
+            return state
+
+    # robots.txt
+
+    def needs_robots(self, host):
+        """Check whether robots.txt still has to be fetched for a host."""
+        return host not in self._robots
+
+    def set_robots(self, host, robots_text):
+        """Cache the parsed robots.txt for a host (None means no usable robots.txt)."""
+        parser = None
+        if robots_text is not None:
+            parser = RobotFileParser()
+            parser.parse(robots_text.splitlines())
+        self._robots[host] = parser
+
+        state = self._state(host)
+        crawl_delay = parser.crawl_delay(self.user_agent) if parser else None
+        if crawl_delay and state.policy.respect_crawl_delay:
+            state.crawl_delay = float(crawl_delay)
+            logger.info(f"robots.txt for {host} sets Crawl-delay: {state.crawl_delay}s")
+            # Crawl-delay is a gap between single requests: no bursts
+            state.apply_delay(max(state.delay, state.crawl_delay), burst=1)
+
+    def can_fetch(self, url):
+        """Check a URL against its host's cached robots.txt rules."""
+        parser = self._robots.get(urlparse(url).netloc)
+        if parser is None:
+            return True
+        return parser.can_fetch(self.user_agent, url)
+
+    def sitemaps(self, host):
+        """Return the Sitemap URLs listed in a host's robots.txt."""
+        parser = self._robots.get(host)
+        return (parser.site_maps() or []) if parser else []
+
+    # Throttling
+
+    def reserve(self, host):
+        """Reserve the next request slot for a host and return the seconds to wait for it."""
+        state = self._state(host)
+        blocked = state.blocked_until - time.monotonic()
+        return max(blocked, state.bucket.reserve())
+
+    def record_response(self, host, status_code, latency, retry_after=None):
+        """Adapt a host's request rate to an observed response."""
+        state = self._state(host)
+        policy = state.policy
+
+        if status_code in (429, 503):
+            backoff = parse_retry_after(retry_after)
+            if backoff is None:
+                backoff = max(state.delay * 2, policy.min_delay)
+            backoff = min(backoff, policy.max_delay)
+            state.blocked_until = time.monotonic() + backoff
+            if policy.adaptive:
+                state.apply_delay(min(policy.max_delay, max(state.delay * 2, policy.min_delay)))
+            logger.warning(f"{host} answered {status_code}; pausing for {backoff:.1f}s "
+                           f"(delay now {state.delay:.2f}s)")
+            return
+
+        if not policy.adaptive:
+            return
+
+        target = latency / self.target_concurrency
+        new_delay = (state.delay + target) / 2.0
+        if status_code >= 400 and new_delay < state.delay:
+            new_delay = state.delay  # Never speed up on error responses
+        floor = max(policy.min_delay, state.crawl_delay)
+        state.apply_delay(min(policy.max_delay, max(floor, new_delay)))
+
+    def record_error(self, host):
+        """Slow down after a connection error or timeout."""
+        state = self._state(host)
+        if state.policy.adaptive:
+            state.apply_delay(min(state.policy.max_delay, max(state.delay * 2, state.policy.min_delay)))
+
+    def current_delay(self, host):
+        """Return the current gap between requests for a host."""
+        return self._state(host).delay
@@ -0,0 +1,49 @@
+# seo_rate_limit.py
+
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=1):
+        """Initialize a token bucket refilling at `rate` tokens per second.
+
+        A rate of None means unlimited: reserve() never asks the caller to wait.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        """Add the tokens earned since the last update."""
+        if self.rate:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, tokens=1):
+        """Take `tokens` from the bucket and return how many seconds the caller must wait.
+
+        The bucket may go into debt, so concurrent callers are queued in the order
+        they reserved. Works for both threads (time.sleep) and asyncio (asyncio.sleep).
+        """
+        if self.rate is None:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def set_rate(self, rate, capacity=None):
+        """Change the refill rate (and optionally the burst capacity)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            if capacity is not None:
+                self.capacity = capacity
+                self.tokens = min(self.tokens, capacity)
@@ -1,10 +1,22 @@
 # seo_recommendation.py (OpenAI version - Modern API)
 
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, RateLimitError, InternalServerError
 import os
 import json
+import time
+import random
+import tempfile
+import asyncio
 import logging
+import weakref
+import functools
+import copy
 from dotenv import load_dotenv
+from seo_rate_limit import TokenBucket
+from seo_politeness import parse_retry_after
+from seo_cache import LLMCache
+from seo_scoring import SEOScorer
+from seo_clustering import TemplateClusters, cluster_pages, fan_out
 
 # Load environment variables
 load_dotenv()
@@ -13,45 +25,176 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+MODEL = "gpt-4o-mini"  # Fast and cost-effective
+SYSTEM_MESSAGE = "You are an expert SEO consultant. Provide concise, actionable recommendations as JSON: an overall score, the critical issues, content recommendations, technical improvements and one quick win."
+TEMPERATURE = 0.3
+MAX_TOKENS = 800  # Keep responses focused
+
+# Structured output: the model must answer with exactly these fields, so results
+# can be used directly instead of scraping scores and sections out of free text
+RECOMMENDATION_FIELDS = ("score", "critical_issues", "content", "technical", "quick_win")
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "seo_recommendations",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "score": {"type": "integer", "description": "Overall SEO score from 0 to 100"},
+                "critical_issues": {"type": "array", "items": {"type": "string"}},
+                "content": {"type": "array", "items": {"type": "string"}},
+                "technical": {"type": "array", "items": {"type": "string"}},
+                "quick_win": {"type": "string"}
+            },
+            "required": list(RECOMMENDATION_FIELDS),
+            "additionalProperties": False
+        }
+    }
+}
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_FINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+# Errors worth retrying: 429 rate limits and transient 5xx responses
+RETRYABLE_ERRORS = (RateLimitError, InternalServerError)
+
+
 class SEORecommendationGenerator:
-    def __init__(self, api_key=None):
-        """Initialize with OpenAI API key."""
+    def __init__(self, api_key=None, requests_per_minute=None, tokens_per_minute=None,
+                 max_concurrency=None, max_retries=5, cache_dir=None, cache_ttl=None,
+                 base_url=None, mode=None, skip_passing_pages=None, cluster_similar_pages=None):
+        """Initialize with OpenAI API key.
+
+        Calls are throttled client-side by two token buckets, one for requests and
+        one for (estimated) tokens per minute, defaulting to SEOLYZER_OPENAI_RPM (500)
+        and SEOLYZER_OPENAI_TPM (200000). At most `max_concurrency` requests
+        (SEOLYZER_OPENAI_CONCURRENCY, default 8) are in flight in async mode, and
+        429/5xx responses are retried up to `max_retries` times with exponential backoff.
+
+        Setting `cache_dir` (or SEOLYZER_LLM_CACHE_DIR) caches responses on disk for
+        `cache_ttl` seconds (SEOLYZER_LLM_CACHE_TTL, default 7 days), so unchanged
+        pages are not sent to the API again.
+
+        `mode` (SEOLYZER_RECOMMENDATION_MODE) picks how process_website_data talks to
+        the API: 'interactive' (default, concurrent requests) or 'batch' (one Batch API
+        job: cheaper, but results can take up to 24 hours). `base_url`
+        (OPENAI_BASE_URL) points the client at a compatible or stand-in server.
+
+        Pages that pass every rule-based check in seo_scoring get a local summary
+        instead of an LLM call unless `skip_passing_pages` (SEOLYZER_SKIP_PASSING_PAGES)
+        is turned off. Likewise, pages sharing a template and issues (see seo_clustering)
+        get one LLM call per cluster unless `cluster_similar_pages`
+        (SEOLYZER_CLUSTER_PAGES) is turned off.
+        """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if requests_per_minute is None:
+            requests_per_minute = int(os.getenv("SEOLYZER_OPENAI_RPM", "500"))
+        if tokens_per_minute is None:
+            tokens_per_minute = int(os.getenv("SEOLYZER_OPENAI_TPM", "200000"))
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("SEOLYZER_OPENAI_CONCURRENCY", "8"))
+        # Buckets hold 6 seconds' worth, so a site's pages go out in one burst while
+        # staying well inside the sub-minute windows OpenAI enforces limits over
+        self.request_bucket = TokenBucket(requests_per_minute / 60, capacity=max(1, requests_per_minute / 10))
+        self.token_bucket = TokenBucket(tokens_per_minute / 60, capacity=tokens_per_minute / 10)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self._semaphores = weakref.WeakKeyDictionary()  # One semaphore per event loop
+        # AsyncOpenAI's connection pool is bound to the loop it was first used on, so
+        # each loop (e.g. each process_website_data call) gets its own client
+        self._async_clients = weakref.WeakKeyDictionary()
+        self.base_url = base_url
+        
+        if cache_dir is None:
+            cache_dir = os.getenv("SEOLYZER_LLM_CACHE_DIR")
+        if cache_ttl is None:
+            cache_ttl = int(os.getenv("SEOLYZER_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+        self.cache = LLMCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+        
+        self.mode = mode or os.getenv("SEOLYZER_RECOMMENDATION_MODE", "interactive")
+        if self.mode not in ("interactive", "batch"):
+            raise ValueError(f"Unknown recommendation mode '{self.mode}'. Choose 'interactive' or 'batch'")
+        self.batch_poll_interval = float(os.getenv("SEOLYZER_BATCH_POLL_SECONDS", "30"))
+        
+        self.scorer = SEOScorer()
+        if skip_passing_pages is None:
+            skip_passing_pages = os.getenv("SEOLYZER_SKIP_PASSING_PAGES", "1") != "0"
+        self.skip_passing_pages = skip_passing_pages
+        if cluster_similar_pages is None:
+            cluster_similar_pages = os.getenv("SEOLYZER_CLUSTER_PAGES", "1") != "0"
+        self.clusters = TemplateClusters(self.scorer) if cluster_similar_pages else None
         
         if not self.api_key:
             logger.warning("No OpenAI API key provided. Set OPENAI_API_KEY environment variable.")
             self.client = None
         else:
-            # Initialize OpenAI client with modern API
-            self.client = OpenAI(api_key=self.api_key)
+            # Initialize OpenAI client with modern API. Retries are handled here so
+            # they go through the rate limiter.
+            self.client = OpenAI(api_key=self.api_key, base_url=base_url, max_retries=0)
             logger.info("Using OpenAI GPT-4o-mini for SEO recommendations")
             
-    def generate_recommendations(self, seo_data):
-        """Generate SEO recommendations using OpenAI."""
+    def for_analysis(self):
+        """Return a generator for one analysis that shares this one's client, rate limits and cache.
+
+        Only the template clusters are per analysis, so a later run over the same
+        site asks the LLM again instead of reusing the earlier run's results.
+        """
+        generator = copy.copy(self)
+        if self.clusters:
+            generator.clusters = TemplateClusters(self.scorer)
+        return generator
+        
+    def generate_recommendations(self, seo_data, on_token=None):
+        """Generate SEO recommendations using OpenAI.
+
+        With clustering on, a page with the same issue signature as an earlier page
+        (even one still in flight on another thread) reuses that page's result.
+        If `on_token(url, text)` is given, the completion is streamed and each piece
+        of text is passed to it as it arrives; cached and reused results are not.
+        """
+        local = self._local_recommendations(seo_data)
+        if local:
+            return local
+        if self.clusters:
+            return self.clusters.recommend(
+                seo_data, functools.partial(self._generate_recommendations, on_token=on_token))
+        return self._generate_recommendations(seo_data, on_token)
+        
+    def _generate_recommendations(self, seo_data, on_token=None):
+        """Call the API for one page (after the local, cache and rate-limit checks)."""
         if not self.client:
             logger.error("Cannot generate recommendations: No OpenAI API key provided.")
             return {"error": "API key not configured"}
             
         try:
-            prompt = self._create_prompt(seo_data)
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Fast and cost-effective
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert SEO consultant. Provide concise, actionable recommendations. Structure your response with: **Overall Score**, **Critical Issues**, **Content Recommendations**, and **Technical Improvements**. Use **bold** formatting for section headers."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=800  # Keep responses focused
-            )
+            request = self._build_request(seo_data)
+            cached = self._cached_recommendations(request, seo_data['url'])
+            if cached:
+                return cached
+            started = time.time()
+            
+            for attempt in range(self.max_retries + 1):
+                time.sleep(self._reserve_capacity(request))
+                try:
+                    if on_token:
+                        stream = self.client.chat.completions.create(**request, stream=True)
+                    else:
+                        response = self.client.chat.completions.create(**request)
+                    break
+                except RETRYABLE_ERRORS as e:
+                    if attempt == self.max_retries:
+                        raise
+                    time.sleep(self._retry_delay(e, attempt, seo_data['url']))
             
-            recommendations = response.choices[0].message.content
+            if on_token:
+                content, refusal = self._read_stream(stream, seo_data['url'], on_token)
+            else:
+                message = response.choices[0].message
+                content, refusal = message.content, message.refusal
+            recommendations = self._parse_recommendations(content, refusal)
+            if self.cache:
+                self.cache.save(request, json.dumps(recommendations), time.time() - started)
             logger.info(f"Successfully generated recommendations for {seo_data['url']}")
             return {"recommendations": recommendations}
             
@@ -59,6 +202,166 @@ class SEORecommendationGenerator:
             logger.error(f"Error generating recommendations: {str(e)}")
             return {"error": str(e)}
             
+    async def agenerate_recommendations(self, seo_data):
+        """Async version of generate_recommendations; many pages can be in flight at once."""
+        local = self._local_recommendations(seo_data)
+        if local:
+            return local
+            
+        if not self.client:
+            logger.error("Cannot generate recommendations: No OpenAI API key provided.")
+            return {"error": "API key not configured"}
+            
+        try:
+            request = self._build_request(seo_data)
+            cached = self._cached_recommendations(request, seo_data['url'])
+            if cached:
+                return cached
+            started = time.time()
+            
+            async with self._semaphore():
+                for attempt in range(self.max_retries + 1):
+                    await asyncio.sleep(self._reserve_capacity(request))
+                    try:
+                        response = await self._async_client().chat.completions.create(**request)
+                        break
+                    except RETRYABLE_ERRORS as e:
+                        if attempt == self.max_retries:
+                            raise
+                        await asyncio.sleep(self._retry_delay(e, attempt, seo_data['url']))
+            
+            message = response.choices[0].message
+            recommendations = self._parse_recommendations(message.content, message.refusal)
+            if self.cache:
+                self.cache.save(request, json.dumps(recommendations), time.time() - started)
+            logger.info(f"Successfully generated recommendations for {seo_data['url']}")
+            return {"recommendations": recommendations}
+            
+        except Exception as e:
+            logger.error(f"Error generating recommendations: {str(e)}")
+            return {"error": str(e)}
+            
+    def _read_stream(self, stream, url, on_token):
+        """Pass a streamed completion's text to on_token(url, text); return (content, refusal)."""
+        content = []
+        refusal = []
+        with stream:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    content.append(delta.content)
+                    on_token(url, delta.content)
+                if getattr(delta, 'refusal', None):
+                    refusal.append(delta.refusal)
+        return ''.join(content), ''.join(refusal) or None
+
+    def config(self):
+        """Return the settings that shape the recommendations (e.g. to key cached analyses)."""
+        return {
+            "model": MODEL,
+            "system_message": SYSTEM_MESSAGE,
+            "temperature": TEMPERATURE,
+            "max_tokens": MAX_TOKENS,
+            "response_format": RESPONSE_FORMAT,
+            "checks": [(name, weight) for name, weight, _ in self.scorer.checks],
+            "skip_passing_pages": self.skip_passing_pages,
+            "cluster_similar_pages": self.clusters is not None,
+        }
+        
+    def _build_request(self, seo_data):
+        """Return the chat.completions.create arguments for a page."""
+        return {
+            "model": MODEL,
+            "messages": [
+                {
+                    "role": "system", 
+                    "content": SYSTEM_MESSAGE
+                },
+                {
+                    "role": "user", 
+                    "content": self._create_prompt(seo_data)
+                }
+            ],
+            "temperature": TEMPERATURE,
+            "max_tokens": MAX_TOKENS,
+            "response_format": RESPONSE_FORMAT
+        }
+        
+    def _local_recommendations(self, seo_data):
+        """Answer a page that passes every rule-based check without calling the API."""
+        if not self.skip_passing_pages or not self.scorer.passes_all(seo_data):
+            return None
+        logger.info(f"All checks pass, skipping the LLM for {seo_data['url']}")
+        return {"recommendations": self.scorer.summary_recommendations(seo_data)}
+        
+    def _cached_recommendations(self, request, url):
+        """Return the cached result for an identical earlier request, or None."""
+        if not self.cache:
+            return None
+        recommendations = self.cache.lookup(request)
+        if recommendations is None:
+            return None
+        logger.info(f"Using cached recommendations for {url}")
+        return {"recommendations": json.loads(recommendations)}
+        
+    def _parse_recommendations(self, content, refusal=None):
+        """Parse the model's JSON answer into a dict with RECOMMENDATION_FIELDS."""
+        if refusal:
+            raise ValueError(f"Model refused: {refusal}")
+        if not content:
+            raise ValueError("Empty response from model")
+        recommendations = json.loads(content)
+        missing = [field for field in RECOMMENDATION_FIELDS if field not in recommendations]
+        if missing:
+            raise ValueError(f"Response is missing fields: {', '.join(missing)}")
+        return recommendations
+        
+    def _reserve_capacity(self, request):
+        """Reserve one request and its estimated tokens; return the seconds to wait."""
+        # Roughly 4 characters per prompt token, plus the completion budget
+        prompt_chars = sum(len(message["content"]) for message in request["messages"])
+        estimated_tokens = prompt_chars // 4 + request["max_tokens"]
+        return max(self.request_bucket.reserve(), self.token_bucket.reserve(estimated_tokens))
+        
+    def _retry_delay(self, error, attempt, url):
+        """Seconds to wait before retrying: the server's retry headers, else exponential backoff."""
+        headers = error.response.headers if getattr(error, 'response', None) is not None else {}
+        delay = None
+        if headers.get("retry-after-ms"):
+            try:
+                delay = float(headers["retry-after-ms"]) / 1000
+            except ValueError:
+                pass
+        if delay is None:
+            delay = parse_retry_after(headers.get("retry-after"))
+        if delay is None:
+            delay = min(60.0, 2 ** attempt) * (0.5 + random.random())  # Jittered backoff
+        logger.warning(f"OpenAI returned {getattr(error, 'status_code', 'an error')} for {url}; "
+                       f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+        return delay
+        
+    def _semaphore(self):
+        """Return the semaphore bounding in-flight requests on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.BoundedSemaphore(self.max_concurrency)
+        return self._semaphores[loop]
+
+    def _async_client(self):
+        """Return the AsyncOpenAI client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if loop not in self._async_clients:
+            self._async_clients[loop] = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+        return self._async_clients[loop]
+
+    async def _close_async_client(self):
+        """Close the running event loop's AsyncOpenAI client, if one was created."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+            
     def _create_prompt(self, seo_data):
         """Create prompt for OpenAI."""
         prompt = f"""
@@ -72,26 +375,195 @@ Word Count: {seo_data['word_count']}
 Structured Data: {", ".join(seo_data['structured_data']['summary'])}
 
 Provide:
-1. **Overall Score:** Give a score from 0-100
-2. **Critical Issues:** Top 3 critical issues to fix immediately
-3. **Content Recommendations:** Content optimization suggestions
-4. **Technical Improvements:** Technical SEO improvements
-5. **Quick Win:** One actionable tip for immediate improvement
+1. score: An overall score from 0-100
+2. critical_issues: Top 3 critical issues to fix immediately
+3. content: Content optimization suggestions
+4. technical: Technical SEO improvements
+5. quick_win: One actionable tip for immediate improvement
 
-Be specific and actionable. Use **bold** formatting for section headers.
+Be specific and actionable.
 """
         return prompt
 
     def process_website_data(self, seo_data_dict):
-        """Process all pages from a website."""
+        """Process all pages from a website, concurrently or as a Batch API job (see `mode`)."""
+        if self.mode == "batch":
+            return self.process_website_data_batch(seo_data_dict)
+        return asyncio.run(self.aprocess_website_data(seo_data_dict))
+        
+    async def aprocess_website_data(self, seo_data_dict):
+        """Async version of process_website_data. Results keep the input order."""
+        logger.info(f"Generating recommendations for {len(seo_data_dict)} pages "
+                    f"(up to {self.max_concurrency} at a time)")
+        clusters = self._clusters(seo_data_dict)
+        try:
+            cluster_recommendations = await asyncio.gather(
+                *(self.agenerate_recommendations(seo_data_dict[cluster[0]]) for cluster in clusters)
+            )
+        finally:
+            await self._close_async_client()
+        page_results = self._fan_out(clusters, cluster_recommendations, seo_data_dict)
+        
+        if self.cache:
+            logger.info(f"LLM cache stats: {self.cache.stats()}")
+            
         results = {}
+        for url, page_data in seo_data_dict.items():
+            results[url] = {
+                "seo_data": page_data,
+                "recommendations": page_results[url].get("recommendations", "Error generating recommendations")
+            }
+            
+        return results
+        
+    def _clusters(self, seo_data_dict):
+        """Group pages into template clusters (one page per cluster when clustering is off)."""
+        if not self.clusters:
+            return [[url] for url in seo_data_dict]
+        clusters = cluster_pages(seo_data_dict, self.scorer)
+        logger.info(f"{len(seo_data_dict)} pages fall into {len(clusters)} template clusters")
+        return clusters
+        
+    def _fan_out(self, clusters, cluster_results, seo_data_dict):
+        """Give every page its cluster representative's result; return {url: result}."""
+        page_results = {}
+        for cluster, result in zip(clusters, cluster_results):
+            page_results[cluster[0]] = result
+            for url in cluster[1:]:
+                page_results[url] = self._local_recommendations(seo_data_dict[url]) or \
+                    fan_out(result, seo_data_dict[cluster[0]], self.scorer.score_page(seo_data_dict[url])['score'])
+        return page_results
         
+    def process_website_data_batch(self, seo_data_dict, batch_file=None):
+        """Process all pages through the OpenAI Batch API and wait for the results.
+
+        Pages that pass every check or have a cached response are answered locally
+        and left out of the batch.
+        """
+        page_results = {}
+        pending = {}
+        for url, page_data in seo_data_dict.items():
+            cached = self._local_recommendations(page_data) or \
+                self._cached_recommendations(self._build_request(page_data), url)
+            if cached:
+                page_results[url] = cached
+            else:
+                pending[url] = page_data
+                
+        if pending:
+            if not self.client:
+                logger.error("Cannot generate recommendations: No OpenAI API key provided.")
+                page_results.update({url: {"error": "API key not configured"} for url in pending})
+            else:
+                path = batch_file
+                if path is None:
+                    fd, path = tempfile.mkstemp(prefix="seolyzer_batch_", suffix=".jsonl")
+                    os.close(fd)
+                try:
+                    # One request per template cluster; the rest of each cluster reuses it
+                    clusters = self._clusters(pending)
+                    representatives = {cluster[0]: pending[cluster[0]] for cluster in clusters}
+                    custom_ids = self.write_batch_file(representatives, path)
+                    batch = self.wait_for_batch(self.submit_batch(path))
+                    batch_results = self.read_batch_results(batch, custom_ids, representatives)
+                    page_results.update(self._fan_out(
+                        clusters, [batch_results[cluster[0]] for cluster in clusters], pending))
+                except Exception as e:
+                    logger.error(f"Error running recommendation batch: {str(e)}")
+                    for url in pending:
+                        page_results.setdefault(url, {"error": str(e)})
+                finally:
+                    if batch_file is None:
+                        os.remove(path)
+                        
+        results = {}
         for url, page_data in seo_data_dict.items():
-            logger.info(f"Generating recommendations for: {url}")
-            page_recommendations = self.generate_recommendations(page_data)
             results[url] = {
                 "seo_data": page_data,
-                "recommendations": page_recommendations.get("recommendations", "Error generating recommendations")
+                "recommendations": page_results[url].get("recommendations", "Error generating recommendations")
             }
             
-        return results
\ No newline at end of file
+        return results
+        
+    def write_batch_file(self, seo_data_dict, path):
+        """Write one Batch API request per page to a JSONL file; return {custom_id: url}."""
+        custom_ids = {}
+        with open(path, "w", encoding="utf-8") as f:
+            for i, (url, page_data) in enumerate(seo_data_dict.items()):
+                custom_id = f"page-{i}"
+                custom_ids[custom_id] = url
+                line = {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": self._build_request(page_data)
+                }
+                f.write(json.dumps(line) + "\n")
+        logger.info(f"Wrote {len(custom_ids)} batch requests to {path}")
+        return custom_ids
+        
+    def submit_batch(self, path):
+        """Upload a batch request file and start the batch job; return the batch id."""
+        client = self.client.with_options(max_retries=3)
+        with open(path, "rb") as f:
+            input_file = client.files.create(file=f, purpose="batch")
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h",
+            metadata={"source": "seolyzer"}
+        )
+        logger.info(f"Submitted recommendation batch {batch.id} ({path})")
+        return batch.id
+        
+    def wait_for_batch(self, batch_id, timeout=None):
+        """Poll a batch every batch_poll_interval seconds until it reaches a final state."""
+        client = self.client.with_options(max_retries=3)
+        started = time.time()
+        while True:
+            batch = client.batches.retrieve(batch_id)
+            counts = batch.request_counts
+            logger.info(f"Batch {batch_id}: {batch.status}"
+                        + (f" ({counts.completed}/{counts.total} done)" if counts else ""))
+            if batch.status in BATCH_FINAL_STATES:
+                return batch
+            if timeout is not None and time.time() - started > timeout:
+                raise TimeoutError(f"Batch {batch_id} still {batch.status} after {timeout}s")
+            time.sleep(self.batch_poll_interval)
+            
+    def read_batch_results(self, batch, custom_ids, seo_data_dict):
+        """Map a finished batch's output (and error) files back to {url: result}."""
+        client = self.client.with_options(max_retries=3)
+        page_results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                url = custom_ids.get(record.get("custom_id"))
+                if url is None:
+                    continue
+                response = record.get("response") or {}
+                if response.get("status_code") == 200:
+                    message = response["body"]["choices"][0]["message"]
+                    try:
+                        recommendations = self._parse_recommendations(message.get("content"), message.get("refusal"))
+                    except ValueError as e:
+                        page_results[url] = {"error": str(e)}
+                        logger.warning(f"Batch request failed for {url}: {str(e)}")
+                        continue
+                    if self.cache:
+                        self.cache.save(self._build_request(seo_data_dict[url]), json.dumps(recommendations), 0.0)
+                    page_results[url] = {"recommendations": recommendations}
+                else:
+                    error = record.get("error") or (response.get("body") or {}).get("error") or {}
+                    page_results[url] = {"error": error.get("message", f"Batch request failed ({batch.status})")}
+                    logger.warning(f"Batch request failed for {url}: {page_results[url]['error']}")
+                    
+        for url in custom_ids.values():
+            page_results.setdefault(url, {"error": f"No batch result (batch {batch.status})"})
+        logger.info(f"Batch {batch.id}: {sum('recommendations' in r for r in page_results.values())}"
+                    f"/{len(custom_ids)} recommendations received")
+        return page_results
@@ -1,71 +1,16 @@
-# seo_report_generator.py (Updated with better formatting and score extraction)
+# seo_report_generator.py (Updated with better formatting and structured recommendations)
 
 import json
 import os
 import logging
-import re
 from datetime import datetime
 from jinja2 import Environment, FileSystemLoader
+from seo_scoring import SEOScorer
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def extract_score_from_recommendations(recommendations):
-    """Extract a numerical score from recommendations text, with improved robustness."""
-    if not recommendations or not isinstance(recommendations, str):
-        return 0
-        
-    # Try multiple patterns to find the score
-    score_patterns = [
-        r'\*\*Overall Score:?\*\*\s*(\d+)[\s/]*\d*',     # **Overall Score:** 75/100
-        r'Overall Score:?\s*(\d+)[\s/]*\d*',             # Overall Score: 75/100
-        r'\*\*Overall Score:?\*\*\s*(\d+)',              # **Overall Score:** 75
-        r'Overall Score:?\s*(\d+)',                      # Overall Score: 75
-        r'\*\*Score:?\*\*\s*(\d+)',                      # **Score:** 75
-        r'Score:?\s*(\d+)',                              # Score: 75
-        r'SEO Score:?\s*(\d+)',                          # SEO Score: 75
-        r'(\d+)/100',                                    # 75/100
-    ]
-    
-    # Try each pattern until we find a match
-    for pattern in score_patterns:
-        match = re.search(pattern, recommendations, re.IGNORECASE)
-        if match:
-            try:
-                score = int(match.group(1))
-                if 0 <= score <= 100:  # Validate it's a reasonable score
-                    return score
-            except (ValueError, IndexError):
-                continue
-    
-    # If no specific score found, look for any number that could be a score
-    numbers = re.findall(r'\b(\d{1,2})\b', recommendations)
-    for num_str in numbers:
-        try:
-            num = int(num_str)
-            if 20 <= num <= 100:  # Only consider numbers in typical score range
-                return num
-        except ValueError:
-            continue
-    
-    # Default if no score found
-    return 40
-
-def format_markdown_to_html(text):
-    """Convert markdown-style formatting to HTML."""
-    if not text or not isinstance(text, str):
-        return text
-        
-    # Convert **text** to <strong>text</strong>
-    # This regex finds **text** patterns and converts them
-    formatted_text = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', text)
-    
-    # Also handle case where there might be extra spaces
-    formatted_text = re.sub(r'\*\* ([^*]+) \*\*', r'<strong>\1</strong>', formatted_text)
-    
-    return formatted_text
-
 class SEOReportGenerator:
     def __init__(self, template_dir="templates"):
         """Initialize the report generator with templates directory."""
@@ -79,6 +24,9 @@ class SEOReportGenerator:
         # Set up Jinja2 environment
         self.env = Environment(loader=FileSystemLoader(template_dir))
         
+        # Page scores come from the deterministic rule-based checks, not the LLM text
+        self.scorer = SEOScorer()
+        
     def generate_html_report(self, seo_results, output_path="seolyzer_report.html"):
         """Generate an HTML report from the SEO results."""
         try:
@@ -106,16 +54,17 @@ class SEOReportGenerator:
                     recommendations = "Error generating recommendations"
                     seo_data = data
                 
-                # Extract score from recommendations text
-                score = extract_score_from_recommendations(recommendations)
+                # Score the page with the rule-based checks
+                page_score = self.scorer.score_page(seo_data)
+                score = page_score["score"]
                 
-                # If score found, add to overall score calculation
-                if score > 0:
-                    overall_score += score
-                    score_count += 1
+                # Add to overall score calculation
+                overall_score += score
+                score_count += 1
                 
-                # Format recommendations with HTML bold tags
-                recommendations_html = format_markdown_to_html(recommendations)
+                # Structured recommendations (a dict) are rendered field by field; anything
+                # else is an error message
+                structured = isinstance(recommendations, dict)
                 
                 page_data = {
                     "url": url,
@@ -124,9 +73,11 @@ class SEOReportGenerator:
                     "h1_tags": seo_data.get("h1_tags", {"count": 0, "contents": ["No H1 tag"]}),
                     "word_count": seo_data.get("word_count", 0),
                     "structured_data": seo_data.get("structured_data", {}).get("summary", ["No data"]),
-                    "recommendations": recommendations if isinstance(recommendations, str) else "Error generating recommendations",
-                    "recommendations_html": recommendations_html if isinstance(recommendations_html, str) else "Error generating recommendations",
-                    "score": score
+                    "recommendations": recommendations if structured else None,
+                    "recommendations_error": None if structured else (recommendations if isinstance(recommendations, str) and recommendations else "Error generating recommendations"),
+                    "llm_score": recommendations.get("score") if structured else None,
+                    "score": score,
+                    "issues": page_score["issues"]
                 }
                 context["pages"].append(page_data)
 
@@ -543,7 +494,6 @@ class SEOReportGenerator:
             background-color: rgba(255, 255, 255, 0.03);
             padding: 20px;
             border-radius: 8px;
-            white-space: pre-line;
             line-height: 1.7;
         }
         
@@ -690,7 +640,13 @@ class SEOReportGenerator:
                     <div class="recommendations-section">
                         <h3>Recommendations</h3>
                         <div class="recommendations">
-                            {{ page.recommendations_html|safe }}
+                            {% if page.issues %}<h4>Automated Checks</h4><ul>{% for issue in page.issues %}<li>{{ issue|e }}</li>{% endfor %}</ul>{% endif %}
+                            {% if page.recommendations %}{% set rec = page.recommendations %}
+                            {% if rec.representative_url %}<p><em>Same template and issues as {{ rec.representative_url|e }}; its recommendations apply to this page too.</em></p>{% endif %}
+                            {% if page.llm_score is not none %}<p><strong>AI Score:</strong> {{ page.llm_score }}/100</p>{% endif %}
+                            {% for heading, items in [("Critical Issues", rec.critical_issues), ("Content Recommendations", rec.content), ("Technical Improvements", rec.technical)] %}{% if items %}<h4>{{ heading }}</h4><ul>{% for item in items %}<li>{{ item|e }}</li>{% endfor %}</ul>{% endif %}{% endfor %}
+                            {% if rec.quick_win %}<p><strong>Quick Win:</strong> {{ rec.quick_win|e }}</p>{% endif %}
+                            {% else %}<p>{{ page.recommendations_error|e }}</p>{% endif %}
                         </div>
                     </div>
                 </div>
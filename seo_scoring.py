@@ -0,0 +1,120 @@
+# seo_scoring.py
+
+import logging
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Placeholders SEOExtractor returns when a field is missing
+NO_TITLE = "No title found"
+NO_DESCRIPTION = "No meta description found"
+NO_STRUCTURED_DATA = "No structured data found"
+
+TITLE_LENGTH = (30, 60)  # Characters shown in most search results
+DESCRIPTION_LENGTH = (70, 160)
+MIN_WORD_COUNT = 300
+THIN_WORD_COUNT = 100
+
+
+def check_title(seo_data):
+    """Score the title: present and within TITLE_LENGTH characters."""
+    title = seo_data.get('meta_title') or NO_TITLE
+    if title == NO_TITLE:
+        return 0.0, "Missing page title"
+    low, high = TITLE_LENGTH
+    if not low <= len(title) <= high:
+        return 0.5, f"Title is {len(title)} characters (aim for {low}-{high})"
+    return 1.0, None
+
+
+def check_description(seo_data):
+    """Score the meta description: present and within DESCRIPTION_LENGTH characters."""
+    description = seo_data.get('meta_description') or NO_DESCRIPTION
+    if description == NO_DESCRIPTION:
+        return 0.0, "Missing meta description"
+    low, high = DESCRIPTION_LENGTH
+    if not low <= len(description) <= high:
+        return 0.5, f"Meta description is {len(description)} characters (aim for {low}-{high})"
+    return 1.0, None
+
+
+def check_h1(seo_data):
+    """Score the H1s: exactly one per page."""
+    count = seo_data.get('h1_tags', {}).get('count', 0)
+    if count == 0:
+        return 0.0, "Missing H1 heading"
+    if count > 1:
+        return 0.5, f"{count} H1 headings (use exactly one)"
+    return 1.0, None
+
+
+def check_word_count(seo_data):
+    """Score the amount of main content."""
+    words = seo_data.get('word_count', 0)
+    if words < THIN_WORD_COUNT:
+        return 0.0, f"Thin content: {words} words"
+    if words < MIN_WORD_COUNT:
+        return 0.5, f"Only {words} words of content (aim for {MIN_WORD_COUNT}+)"
+    return 1.0, None
+
+
+def check_structured_data(seo_data):
+    """Score structured data: any JSON-LD, microdata or RDFa."""
+    summary = seo_data.get('structured_data', {}).get('summary', [NO_STRUCTURED_DATA])
+    if not summary or summary == [NO_STRUCTURED_DATA]:
+        return 0.0, "No structured data"
+    return 1.0, None
+
+
+# (name, weight, check) - weights add up to 100
+CHECKS = (
+    ('title', 25, check_title),
+    ('meta_description', 20, check_description),
+    ('h1', 20, check_h1),
+    ('word_count', 20, check_word_count),
+    ('structured_data', 15, check_structured_data),
+)
+
+
+class SEOScorer:
+    def __init__(self, checks=CHECKS):
+        """Initialize a deterministic, rule-based scorer over SEOExtractor output."""
+        self.checks = checks
+        self.max_points = sum(weight for _, weight, _ in checks)
+
+    def score_page(self, seo_data):
+        """Return {'score': 0-100, 'issues': [...], 'checks': {name: fraction passed}}."""
+        points = 0.0
+        issues = []
+        results = {}
+        for name, weight, check in self.checks:
+            fraction, issue = check(seo_data)
+            points += weight * fraction
+            results[name] = fraction
+            if issue:
+                issues.append(issue)
+        return {
+            'score': round(100 * points / self.max_points),
+            'issues': issues,
+            'checks': results,
+        }
+
+    def score_pages(self, seo_data_dict):
+        """Score every page of a {url: seo_data} mapping."""
+        return {url: self.score_page(seo_data) for url, seo_data in seo_data_dict.items()}
+
+    def passes_all(self, seo_data):
+        """Check whether a page passes every check (nothing for an LLM to fix)."""
+        return all(check(seo_data)[0] == 1.0 for _, _, check in self.checks)
+
+    def summary_recommendations(self, seo_data):
+        """Recommendations for a page that passes every check, used instead of an LLM call."""
+        return {
+            "score": self.score_page(seo_data)['score'],
+            "critical_issues": [],
+            "content": [],
+            "technical": [],
+            "quick_win": "No issues found by the automated checks (title and meta description length, "
+                         "a single H1, enough content, structured data). Keep the title and description "
+                         "aligned with the page's main keyword."
+        }
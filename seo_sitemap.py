@@ -0,0 +1,144 @@
+# seo_sitemap.py
+
+import gzip
+import heapq
+import itertools
+import logging
+import xml.etree.ElementTree as ET
+from collections import namedtuple, deque
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SitemapEntry = namedtuple('SitemapEntry', ['loc', 'lastmod', 'priority'])
+
+DEFAULT_PRIORITY = 0.5  # Sitemap protocol default when <priority> is missing
+
+
+def _local_name(tag):
+    """Strip the XML namespace from a tag name."""
+    return tag.rsplit('}', 1)[-1]
+
+
+class _PrefixedStream:
+    def __init__(self, prefix, raw):
+        """A read-only stream that replays `prefix` before the rest of `raw`."""
+        self.prefix = prefix
+        self.raw = raw
+
+    def read(self, size=-1):
+        if not self.prefix:
+            return self.raw.read() if size is None or size < 0 else self.raw.read(size)
+        if size is None or size < 0:
+            data, self.prefix = self.prefix + self.raw.read(), b''
+            return data
+        data, self.prefix = self.prefix[:size], self.prefix[size:]
+        if len(data) < size:
+            data += self.raw.read(size - len(data))
+        return data
+
+    def close(self):
+        self.raw.close()
+
+
+def decompressed_stream(raw):
+    """Wrap a raw byte stream, transparently gunzipping it if it is gzip-compressed."""
+    stream = _PrefixedStream(raw.read(2), raw)
+    if stream.prefix == b'\x1f\x8b':
+        return gzip.GzipFile(fileobj=stream)
+    return stream
+
+
+def iter_sitemap(stream):
+    """Incrementally parse a sitemap or sitemap index.
+
+    Yields ('url', SitemapEntry) for page entries and ('sitemap', SitemapEntry)
+    for nested sitemaps. Processed elements are cleared as we go, so memory use
+    does not grow with the size of the sitemap.
+    """
+    root = None
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = elem
+            continue
+
+        kind = _local_name(elem.tag)
+        if kind not in ('url', 'sitemap'):
+            continue
+
+        fields = {_local_name(child.tag): (child.text or '').strip() for child in elem}
+        root.clear()
+
+        loc = fields.get('loc')
+        if not loc:
+            continue
+        try:
+            priority = float(fields['priority']) if fields.get('priority') else DEFAULT_PRIORITY
+        except ValueError:
+            priority = DEFAULT_PRIORITY
+        yield kind, SitemapEntry(loc, fields.get('lastmod') or None, priority)
+
+
+class SitemapReader:
+    def __init__(self, open_stream, max_sitemaps=50):
+        """Initialize a reader that walks sitemaps and nested sitemap indexes.
+
+        `open_stream(url)` must return a readable binary stream for a sitemap URL
+        (or None if it cannot be fetched).
+        """
+        self.open_stream = open_stream
+        self.max_sitemaps = max_sitemaps
+        self.sitemaps_read = 0
+        self.urls_seen = 0
+
+    def iter_entries(self, sitemap_urls):
+        """Yield SitemapEntry objects for every page listed in the sitemaps, following indexes."""
+        queue = deque(sitemap_urls)
+        visited = set()
+
+        while queue and self.sitemaps_read < self.max_sitemaps:
+            sitemap_url = queue.popleft()
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+
+            stream = self.open_stream(sitemap_url)
+            if stream is None:
+                continue
+
+            self.sitemaps_read += 1
+            logger.info(f"Reading sitemap: {sitemap_url}")
+            try:
+                for kind, entry in iter_sitemap(decompressed_stream(stream)):
+                    if kind == 'sitemap':
+                        queue.append(entry.loc)
+                    else:
+                        self.urls_seen += 1
+                        yield entry
+            except (ET.ParseError, OSError, EOFError) as e:
+                logger.warning(f"Could not parse sitemap {sitemap_url}: {str(e)}")
+            finally:
+                stream.close()
+
+    def top_entries(self, sitemap_urls, limit, accept=None, max_scanned=None):
+        """Return the `limit` best entries (priority, then lastmod) using bounded memory.
+
+        Stops reading once `max_scanned` entries have been seen, so a site with
+        millions of sitemap URLs doesn't delay the crawl; the best of those seen wins.
+        """
+        heap = []
+        counter = itertools.count()
+        entries = self.iter_entries(sitemap_urls)
+        try:
+            for entry in itertools.islice(entries, max_scanned):
+                if accept is not None and not accept(entry.loc):
+                    continue
+                key = (entry.priority, entry.lastmod or '', -next(counter))
+                if len(heap) < limit:
+                    heapq.heappush(heap, (key, entry))
+                elif key > heap[0][0]:
+                    heapq.heapreplace(heap, (key, entry))
+        finally:
+            entries.close()  # Closes the sitemap being read if we stopped early
+        return [entry for _, entry in sorted(heap, reverse=True)]
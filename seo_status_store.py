@@ -0,0 +1,358 @@
+# seo_status_store.py
+
+import os
+import json
+import sqlite3
+import threading
+import time
+import logging
+from collections import Counter
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 3600  # Seconds an analysis status is kept after its last update
+PURGE_INTERVAL = 60  # Seconds between sweeps for expired statuses
+FINISHED_STATES = ('completed', 'error')
+DEFAULT_LEASE = 120  # Seconds a claim outlives its job's last update or heartbeat (touch)
+CHANGE_POLL_INTERVAL = 0.5  # Seconds between checks for changes made by other processes
+
+
+class MemoryStatusStore:
+    def __init__(self, ttl=DEFAULT_TTL, lease=DEFAULT_LEASE):
+        """Initialize an in-process analysis status store.
+
+        Statuses are JSON-serializable dicts. Each one expires `ttl` seconds after
+        its last update, so finished analyses don't accumulate over weeks of uptime.
+        Only visible to the process that holds it; see SQLiteStatusStore.
+        """
+        self.ttl = ttl
+        self.lease = lease
+        self._entries = {}  # job_id -> (status, version, updated)
+        self._claims = {}  # key -> job_id of the analysis in flight for it
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._purged = time.time()
+
+    def get(self, job_id):
+        """Return a copy of a job's status, or None if it is unknown or expired."""
+        return self.get_versioned(job_id)[0]
+
+    def get_versioned(self, job_id):
+        """Return (status, version); the version goes up with every change. (None, 0) if unknown."""
+        with self._lock:
+            entry = self._live_entry(job_id, time.time())
+            return (json.loads(entry[0]), entry[1]) if entry else (None, 0)
+
+    def wait_for_change(self, job_id, version, timeout):
+        """Block until a job's version differs from `version` or `timeout` seconds pass; return get_versioned()."""
+        with self._changed:
+            self._changed.wait_for(lambda: (self._entries.get(job_id) or (None, 0))[1] != version, timeout)
+        return self.get_versioned(job_id)
+
+    def set(self, job_id, status):
+        """Create or replace a job's status."""
+        data = json.dumps(status)  # Fail here, not in another process, on unserializable values
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(job_id)
+            self._entries[job_id] = (data, entry[1] + 1 if entry else 1, now)
+            self._changed.notify_all()
+            self._maybe_purge(now)
+
+    def update(self, job_id, fields):
+        """Merge fields into a job's status; return the new status, or None if the job is unknown."""
+        now = time.time()
+        with self._lock:
+            entry = self._live_entry(job_id, now)
+            if entry is None:
+                return None
+            status = json.loads(entry[0])
+            status.update(fields)
+            self._entries[job_id] = (json.dumps(status), entry[1] + 1, now)
+            self._changed.notify_all()
+            return status
+
+    def delete(self, job_id):
+        """Remove a job's status."""
+        with self._lock:
+            self._entries.pop(job_id, None)
+            self._changed.notify_all()
+
+    def touch(self, job_ids):
+        """Heartbeat: mark running jobs as alive without changing their status or version."""
+        now = time.time()
+        with self._lock:
+            for job_id in job_ids:
+                entry = self._entries.get(job_id)
+                if entry:
+                    self._entries[job_id] = (entry[0], entry[1], now)
+
+    def claim(self, key, job_id):
+        """Atomically make job_id the analysis in flight for `key`, unless another one still is.
+
+        Returns the id of the job that owns the key: job_id, or the unfinished job
+        that claimed it earlier. A claim lapses when its job finishes or is deleted,
+        or when the job hasn't been updated or touched for `lease` seconds.
+        """
+        with self._lock:
+            owner = self._claims.get(key)
+            if owner is not None and owner != job_id:
+                now = time.time()
+                entry = self._live_entry(owner, now)
+                if entry and now - entry[2] <= self.lease and \
+                        json.loads(entry[0]).get('status') not in FINISHED_STATES:
+                    return owner
+            self._claims[key] = job_id
+            return job_id
+
+    def _live_entry(self, job_id, now):
+        entry = self._entries.get(job_id)
+        if entry and now - entry[2] > self.ttl:
+            del self._entries[job_id]
+            return None
+        return entry
+
+    def _maybe_purge(self, now):
+        """Drop expired statuses, at most once per PURGE_INTERVAL."""
+        if now - self._purged < PURGE_INTERVAL:
+            return
+        self._purged = now
+        expired = [job_id for job_id, entry in self._entries.items() if now - entry[2] > self.ttl]
+        for job_id in expired:
+            del self._entries[job_id]
+        for key, job_id in list(self._claims.items()):
+            if job_id not in self._entries:
+                del self._claims[key]
+        if expired:
+            logger.info(f"Evicted {len(expired)} expired analysis statuses")
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteStatusStore:
+    def __init__(self, path, ttl=DEFAULT_TTL, lease=DEFAULT_LEASE):
+        """Initialize an analysis status store in a SQLite file shared by several server processes.
+
+        Every process (e.g. each gunicorn worker) opening the same file sees the
+        same statuses, so /status, /report and /download work whichever process
+        ran the analysis. Statuses expire `ttl` seconds after their last update.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.ttl = ttl
+        self.lease = lease
+        self._lock = threading.Lock()
+        # wait_for_change() waiters sleep on _changed. One poller thread per store
+        # tracks the versions of watched jobs (written by any process) and wakes them.
+        self._changed = threading.Condition()
+        self._watchers = Counter()  # job_id -> number of waiting callers
+        self._versions = {}  # job_id -> last seen version of a watched job
+        self._poller = None
+        self._purged = 0
+        # Autocommit; update() opens its own write transaction
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS statuses ("
+            " job_id TEXT PRIMARY KEY, status TEXT, version INTEGER, updated REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS statuses_updated ON statuses (updated)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS claims (key TEXT PRIMARY KEY, job_id TEXT)")
+
+    def get(self, job_id):
+        """Return a job's status, or None if it is unknown or expired."""
+        return self.get_versioned(job_id)[0]
+
+    def get_versioned(self, job_id):
+        """Return (status, version); the version goes up with every change. (None, 0) if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, version FROM statuses WHERE job_id = ? AND updated >= ?",
+                (job_id, time.time() - self.ttl)
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else (None, 0)
+
+    def wait_for_change(self, job_id, version, timeout):
+        """Block until a job's version differs from `version` or `timeout` seconds pass; return get_versioned().
+
+        Changes made by this process wake the caller at once; changes made by other
+        processes are noticed by the store's poller within CHANGE_POLL_INTERVAL seconds.
+        """
+        status, current = self.get_versioned(job_id)
+        if current != version or timeout <= 0:
+            return status, current
+        with self._changed:
+            self._watchers[job_id] += 1
+            self._versions.setdefault(job_id, current)
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll, name="seo-status-poller", daemon=True)
+                self._poller.start()
+            try:
+                self._changed.wait_for(lambda: self._versions.get(job_id, 0) != version, timeout)
+            finally:
+                self._watchers[job_id] -= 1
+                if not self._watchers[job_id]:
+                    del self._watchers[job_id]
+                    del self._versions[job_id]
+        return self.get_versioned(job_id)
+
+    def _poll(self):
+        """Refresh the versions of all watched jobs with one query per interval; exit when none are left."""
+        while True:
+            time.sleep(CHANGE_POLL_INTERVAL)
+            with self._changed:
+                if not self._watchers:
+                    self._poller = None
+                    return
+                job_ids = list(self._watchers)
+            try:
+                self._refresh_versions(job_ids)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not poll analysis statuses: {str(e)}")
+
+    def _refresh_versions(self, job_ids):
+        """Record the current versions of watched jobs and wake waiters if any changed."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT job_id, version FROM statuses WHERE job_id IN ({', '.join('?' * len(job_ids))})"
+                " AND updated >= ?",
+                (*job_ids, time.time() - self.ttl)
+            ).fetchall()
+        versions = dict(rows)
+        with self._changed:
+            changed = False
+            for job_id in job_ids:
+                if job_id in self._versions and self._versions[job_id] != versions.get(job_id, 0):
+                    self._versions[job_id] = versions.get(job_id, 0)
+                    changed = True
+            if changed:
+                self._changed.notify_all()
+
+    def _notify(self, job_id):
+        """Wake this process' waiters on job_id right after a local write."""
+        with self._changed:
+            watched = job_id in self._watchers
+        if watched:
+            self._refresh_versions([job_id])
+
+    def set(self, job_id, status):
+        """Create or replace a job's status."""
+        data = json.dumps(status)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO statuses (job_id, status, version, updated) VALUES (?, ?, 1, ?)"
+                " ON CONFLICT (job_id) DO UPDATE SET"
+                " status = excluded.status, version = version + 1, updated = excluded.updated",
+                (job_id, data, now)
+            )
+            self._maybe_purge(now)
+        self._notify(job_id)
+
+    def update(self, job_id, fields):
+        """Merge fields into a job's status; return the new status, or None if the job is unknown."""
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so a concurrent update from
+            # another process can't interleave between the read and the write
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT status FROM statuses WHERE job_id = ? AND updated >= ?",
+                    (job_id, now - self.ttl)
+                ).fetchone()
+                if row is None:
+                    return None
+                status = json.loads(row[0])
+                status.update(fields)
+                self._conn.execute(
+                    "UPDATE statuses SET status = ?, version = version + 1, updated = ? WHERE job_id = ?",
+                    (json.dumps(status), now, job_id)
+                )
+            finally:
+                self._conn.execute("COMMIT")
+        self._notify(job_id)
+        return status
+
+    def delete(self, job_id):
+        """Remove a job's status."""
+        with self._lock:
+            self._conn.execute("DELETE FROM statuses WHERE job_id = ?", (job_id,))
+        self._notify(job_id)
+
+    def touch(self, job_ids):
+        """Heartbeat: mark running jobs as alive without changing their status or version."""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE statuses SET updated = ? WHERE job_id IN ({', '.join('?' * len(job_ids))})",
+                (time.time(), *job_ids)
+            )
+
+    def claim(self, key, job_id):
+        """Atomically make job_id the analysis in flight for `key`, unless another one still is.
+
+        Returns the id of the job that owns the key: job_id, or the unfinished job
+        that claimed it earlier (possibly in another process). A claim lapses when
+        its job finishes or is deleted, or when the job hasn't been updated or
+        touched for `lease` seconds, e.g. because the process running it died.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT claims.job_id, statuses.status FROM claims"
+                    " JOIN statuses ON statuses.job_id = claims.job_id"
+                    " WHERE claims.key = ? AND statuses.updated >= ?",
+                    (key, time.time() - self.lease)
+                ).fetchone()
+                if row and row[0] != job_id and json.loads(row[1]).get('status') not in FINISHED_STATES:
+                    return row[0]
+                self._conn.execute("INSERT OR REPLACE INTO claims (key, job_id) VALUES (?, ?)", (key, job_id))
+                return job_id
+            finally:
+                self._conn.execute("COMMIT")
+
+    def _maybe_purge(self, now):
+        """Drop expired statuses, at most once per PURGE_INTERVAL."""
+        if now - self._purged < PURGE_INTERVAL:
+            return
+        self._purged = now
+        deleted = self._conn.execute("DELETE FROM statuses WHERE updated < ?", (now - self.ttl,)).rowcount
+        self._conn.execute("DELETE FROM claims WHERE job_id NOT IN (SELECT job_id FROM statuses)")
+        if deleted:
+            logger.info(f"Evicted {deleted} expired analysis statuses")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM statuses").fetchone()[0]
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def get_status_store(path=None, ttl=None, lease=None):
+    """Return a SQLite status store if `path` (or SEOLYZER_STATUS_DB) is set, else an in-memory one.
+
+    `ttl` defaults to SEOLYZER_STATUS_TTL or one day, `lease` to SEOLYZER_CLAIM_LEASE
+    or two minutes.
+    """
+    if path is None:
+        path = os.getenv("SEOLYZER_STATUS_DB")
+    if ttl is None:
+        ttl = int(os.getenv("SEOLYZER_STATUS_TTL", str(DEFAULT_TTL)))
+    if lease is None:
+        lease = int(os.getenv("SEOLYZER_CLAIM_LEASE", str(DEFAULT_LEASE)))
+    if path:
+        return SQLiteStatusStore(path, ttl, lease)
+    return MemoryStatusStore(ttl, lease)